@@ -0,0 +1,10 @@
+"""
+Shared pytest setup for the Training CLI tests.
+"""
+import os
+import tempfile
+
+# The data file path is resolved from HOME when training_cli is imported, so point
+# it at a scratch directory before any test module imports the package
+os.environ["HOME"] = tempfile.mkdtemp()
+os.environ["MPLBACKEND"] = "Agg"
@@ -16,16 +16,17 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/TrainingCli",
     packages=find_packages(),
+    package_data={"training_cli": ["_static_help.json"]},
     install_requires=requirements,
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     entry_points={
         "console_scripts": [
-            "training=training_cli:cli",
+            "training=training_cli:main",
         ],
     },
 )
\ No newline at end of file
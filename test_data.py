@@ -0,0 +1,132 @@
+"""
+Tests for loading and saving the data file, the entry log and the caches.
+"""
+import json
+import os
+import pickle
+import pytest
+from training_cli.utils import data as data_module
+from training_cli.utils.data import DATA_FILE, LOG_FILE, CACHE_FILE, load_data, save_data, append_entry
+
+def _remove_data_files():
+    for path in (DATA_FILE, LOG_FILE, CACHE_FILE, DATA_FILE + ".tmp"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+@pytest.fixture(autouse=True)
+def fresh_data(monkeypatch):
+    """Start each test without a data file and without this process's cached state."""
+    _remove_data_files()
+    for name in ("_loaded", "_loaded_key", "_checked_stat", "_file_digest"):
+        monkeypatch.setattr(data_module, name, None)
+    yield
+    _remove_data_files()
+
+def forget_loaded(monkeypatch):
+    """Drop this process's copy of the data, as if a new process were loading it."""
+    monkeypatch.setattr(data_module, "_loaded", None)
+    monkeypatch.setattr(data_module, "_loaded_key", None)
+
+def add_entry(data, date, amount):
+    entry = {"exercise_type": "pushup", "amount": amount, "unit": "reps", "weight": 0, "sets": 1, "timestamp": "08:00:00"}
+    data["entries"].setdefault(date, []).append(entry)
+    append_entry(data, date, entry)
+
+def amounts(data):
+    return {date: [entry["amount"] for entry in entries] for date, entries in data["entries"].items()}
+
+def test_appended_entry_survives_fresh_load(monkeypatch):
+    """Entries appended to the log are read back by a load that starts from scratch."""
+    add_entry(load_data(), "2026-10-01", 5)
+    assert os.path.exists(LOG_FILE)
+
+    forget_loaded(monkeypatch)
+    os.remove(CACHE_FILE)
+    assert amounts(load_data()) == {"2026-10-01": [5]}
+
+def test_large_log_is_folded_into_data_file(monkeypatch):
+    """A log that outgrows LOG_COMPACT_SIZE is written into the data file and deleted."""
+    monkeypatch.setattr(data_module, "LOG_COMPACT_SIZE", 0)
+    add_entry(load_data(), "2026-10-01", 5)
+
+    assert not os.path.exists(LOG_FILE)
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        assert amounts(json.load(f)) == {"2026-10-01": [5]}
+
+def test_torn_log_line_keeps_next_entry(monkeypatch):
+    """An entry appended after an interrupted write is still read back."""
+    data = load_data()
+    add_entry(data, "2026-10-01", 5)
+    with open(LOG_FILE, "ab") as f:
+        f.write(b'{"date":"2026-10-02","entry":{"exer')
+    add_entry(data, "2026-10-03", 7)
+
+    forget_loaded(monkeypatch)
+    os.remove(CACHE_FILE)
+    assert amounts(load_data()) == {"2026-10-01": [5], "2026-10-03": [7]}
+
+def write_data_file(contents):
+    """Rewrite the data file from outside, as another program or a hand edit would."""
+    with open(DATA_FILE, "w", encoding="utf-8") as f:
+        json.dump(contents, f)
+
+def test_outside_rewrite_is_picked_up(monkeypatch):
+    """Loads after the data file is rewritten from outside return the new contents."""
+    data = load_data()
+    data["entries"] = {"2026-10-01": [{"exercise_type": "pushup", "amount": 5, "unit": "reps", "weight": 0, "sets": 1}]}
+    write_data_file(data)
+
+    # Same process, so this goes through the in-process copy's check
+    assert amounts(load_data()) == {"2026-10-01": [5]}
+
+    # A new process finds the pickle cache out of date too
+    data["entries"]["2026-10-02"] = [{"exercise_type": "pushup", "amount": 12, "unit": "reps", "weight": 0, "sets": 1}]
+    write_data_file(data)
+    forget_loaded(monkeypatch)
+    assert amounts(load_data()) == {"2026-10-01": [5], "2026-10-02": [12]}
+
+def test_outside_rewrite_is_migrated():
+    """A data file rewritten in an old layout after a load is migrated again."""
+    load_data()
+    write_data_file({"entries": [{"exercise_type": "pushup", "amount": 5, "unit": "reps"}]})
+
+    data = load_data()
+    assert data["goal_history"] == {}
+    assert [(entry["amount"], entry["weight"], entry["sets"]) for entries in data["entries"].values() for entry in entries] == [(5, 0, 1)]
+
+def test_old_cache_format_is_ignored(monkeypatch):
+    """A pickle cache written in an older format is not used, even if it matches the data file."""
+    data = load_data()
+    with open(CACHE_FILE, "wb") as f:
+        pickle.dump((data_module.CACHE_FORMAT - 1, data_module._data_file_key(), None, {"entries": {"stale": []}}), f)
+
+    forget_loaded(monkeypatch)
+    assert load_data() == data
+
+def test_unchanged_save_leaves_data_file_alone():
+    """Saving data identical to the data file's contents doesn't rewrite it."""
+    data = load_data()
+    save_data(data)
+    os.utime(DATA_FILE, ns=(1_000_000_000, 1_000_000_000))
+
+    save_data(data)
+    assert os.stat(DATA_FILE).st_mtime_ns == 1_000_000_000
+
+def test_save_with_entry_log_writes_file_and_removes_log(monkeypatch):
+    """Saving while the entry log exists rewrites the data file and removes the log."""
+    data = load_data()
+    save_data(data)
+    os.utime(DATA_FILE, ns=(1_000_000_000, 1_000_000_000))
+
+    # Clearing a logged entry leaves data that matches the data file again
+    add_entry(data, "2026-10-01", 5)
+    del data["entries"]["2026-10-01"]
+    save_data(data)
+
+    assert os.stat(DATA_FILE).st_mtime_ns != 1_000_000_000
+    assert not os.path.exists(LOG_FILE)
+    forget_loaded(monkeypatch)
+    os.remove(CACHE_FILE)
+    assert amounts(load_data()) == {}
@@ -0,0 +1,48 @@
+"""
+Tests for goal history kept across goal changes and `clear --goals`.
+"""
+import datetime
+import os
+import matplotlib.axes
+from click.testing import CliRunner
+from training_cli import cli
+from training_cli.utils.data import load_data
+from training_cli.utils.helpers import expand_goal_history
+
+runner = CliRunner()
+
+def invoke(args):
+    """Run a CLI command in-process and fail on unexpected exceptions."""
+    result = runner.invoke(cli, args, prog_name="training")
+    assert result.exception is None or isinstance(result.exception, SystemExit), result.output
+    return result
+
+def test_goal_line_after_clearing_goals(monkeypatch):
+    """Goals cleared and recreated don't change the goal line for earlier dates."""
+    yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+    invoke(["add", "pushup", "--reps", "10", "--sets", "1", "-d", yesterday])
+
+    # Default pushup goal is 50 reps x3 at 0 kg, effective since 2023-01-01
+    invoke(["goal", "pushup", "--weight", "5"])
+    invoke(["goal", "pushup", "--daily", "40"])
+    invoke(["clear", "--goals", "-f"])
+    invoke(["goal", "pushup", "--daily", "20"])
+
+    data = load_data()
+    snapshots = expand_goal_history(data["goal_history"]["pushup"], data["goals"]["pushup"])
+    assert snapshots[0] == {"daily": 50, "sets": 3, "weight": 0, "effective_date": "2023-01-01"}
+    assert {"daily": 40, "sets": 3, "weight": 5} in [
+        {k: v for k, v in goal.items() if k != "effective_date"} for goal in snapshots
+    ]
+
+    # The graph range starts before today, so the line shows the original goal
+    labels = []
+    axhline = matplotlib.axes.Axes.axhline
+    def record_axhline(self, *args, **kwargs):
+        labels.append(kwargs.get("label"))
+        return axhline(self, *args, **kwargs)
+    monkeypatch.setattr(matplotlib.axes.Axes, "axhline", record_axhline)
+
+    output = os.path.join(os.environ["HOME"], "pushup.png")
+    invoke(["graph", "-e", "pushup", "-o", output])
+    assert labels == ["Daily Goal (50 reps x3)"]
@@ -0,0 +1,40 @@
+"""
+Tests for the table renderer used by the list command.
+"""
+from tabulate import tabulate
+from training_cli.commands.list import _render_table
+
+def test_matches_tabulate_simple_for_ascii_rows():
+    """ASCII text tables render exactly like tabulate's "simple" format."""
+    cases = [
+        (["Exercise", "Amount", "Time"], [
+            ["pushup", "10 reps x2", "08:00:00"],
+            ["plank", "1m 30s", "10:00:00"],
+            ["run", "5.5 km", "11:00:00"],
+        ]),
+        (["Exercise", "Total", "Progress"], [
+            ["curl", "36 reps (3 sets, 180.0 kg total)", "[##########----------] 50%"],
+            ["a", "", " padded "],
+        ]),
+        (["Exercise", "Total"], []),
+    ]
+    for headers, rows in cases:
+        assert _render_table(headers, rows) == tabulate(rows, headers=headers, tablefmt="simple")
+
+def test_wide_characters_keep_columns_aligned():
+    """Wide characters count as two columns when padding cells."""
+    table = _render_table(["Exercise", "Amount"], [
+        ["腕立て", "10 reps"],
+        ["pushup", "20 reps"],
+    ]).splitlines()
+    assert table == [
+        "Exercise    Amount",
+        "----------  --------",
+        "腕立て      10 reps",
+        "pushup      20 reps",
+    ]
+
+def test_numeric_looking_names_are_kept_as_text():
+    """Cells that look like numbers are printed verbatim and left-aligned."""
+    table = _render_table(["Exercise", "Amount"], [["1e3", "5 reps"], ["100", "8 reps"]])
+    assert table.splitlines()[2:] == ["1e3         5 reps", "100         8 reps"]
@@ -0,0 +1,11 @@
+"""
+Tests for the static help snapshot.
+"""
+import json
+from training_cli.static_help import HELP_FILE, build_static_help
+
+def test_snapshot_matches_live_help():
+    """The committed help snapshot matches the help click renders for the commands."""
+    with open(HELP_FILE, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert build_static_help() == snapshot, "Stale help snapshot; regenerate it with python -m training_cli.static_help"
@@ -1,42 +1,44 @@
 """
 Simple test script for the Training CLI application.
 """
-import subprocess
-import sys
+from click.testing import CliRunner
+from training_cli import cli
 
-def run_command(command):
-    """Run a command and print the output."""
-    print(f"Running: {command}")
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
+runner = CliRunner()
+
+def run_command(args):
+    """Run a CLI command in-process and print the output."""
+    print(f"Running: training {' '.join(args)}")
+    result = runner.invoke(cli, args, prog_name="training")
     print("Output:")
-    print(result.stdout)
-    if result.stderr:
+    print(result.output)
+    if result.exception and not isinstance(result.exception, SystemExit):
         print("Error:")
-        print(result.stderr)
+        print(repr(result.exception))
     print("-" * 50)
     return result
 
 def main():
     """Run basic tests for the Training CLI application."""
     # Test help command
-    run_command("training --help")
-    
+    run_command(["--help"])
+
     # Test add command help
-    run_command("training add --help")
-    
+    run_command(["add", "--help"])
+
     # Test goal command help
-    run_command("training goal --help")
-    
+    run_command(["goal", "--help"])
+
     # Test list command help
-    run_command("training list --help")
-    
+    run_command(["list", "--help"])
+
     # Test clear command help
-    run_command("training clear --help")
-    
+    run_command(["clear", "--help"])
+
     # Test graph command help
-    run_command("training graph --help")
-    
+    run_command(["graph", "--help"])
+
     print("All tests completed.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
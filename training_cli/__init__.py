@@ -1,28 +1,46 @@
 """
 Training CLI - A command-line tool for tracking exercise activities.
 """
+import importlib
+import sys
 import click
 
-@click.group()
+
+class LazyGroup(click.Group):
+    """Click group that imports a subcommand's module only when it is invoked."""
+
+    # Command name -> "module:attribute" of the click command
+    _lazy = {
+        "add": "training_cli.commands.add:add",
+        "goal": "training_cli.commands.goal:goal",
+        "list": "training_cli.commands.list:list_exercises",
+        "clear": "training_cli.commands.clear:clear",
+        "graph": "training_cli.commands.graph:graph",
+        "stats": "training_cli.commands.stats:stats",
+    }
+
+    def list_commands(self, ctx):
+        return sorted(self._lazy.keys())
+
+    def get_command(self, ctx, name):
+        if name not in self._lazy:
+            return None
+        module_path, attr = self._lazy[name].rsplit(":", 1)
+        mod = importlib.import_module(module_path)
+        return getattr(mod, attr)
+
+
+@click.group(cls=LazyGroup)
 def cli():
     """Training CLI - A command-line tool for tracking exercise activities."""
     pass
 
-# Import and register commands
-from training_cli.commands.add import add
-from training_cli.commands.goal import goal
-from training_cli.commands.list import list_exercises
-from training_cli.commands.clear import clear
-from training_cli.commands.graph import graph
-from training_cli.commands.stats import stats
-
-# Register commands
-cli.add_command(add)
-cli.add_command(goal)
-cli.add_command(list_exercises)
-cli.add_command(clear)
-cli.add_command(graph)
-cli.add_command(stats)
+def main():
+    """Console entry point: serve --help from the static snapshot, else run the CLI."""
+    from training_cli.static_help import print_static_help
+    if print_static_help(sys.argv[1:]):
+        return
+    cli()
 
 if __name__ == "__main__":
-    cli()
+    main()
@@ -3,11 +3,16 @@ Add command for the Training CLI application.
 Allows adding an exercise to the tracker.
 """
 import click
-import datetime
-from tabulate import tabulate
-from training_cli.utils.data import load_data, save_data
+from training_cli.utils.data import load_data, save_data, append_entry
 from training_cli.utils.helpers import get_today_date, validate_date, format_exercise_amount
 
+# Prompt text and value type used to ask for the amount of each unit
+_UNIT_PROMPT = {
+    "reps": ("Enter number of {} repetitions", int),
+    "seconds": ("Enter duration of {} in seconds", int),
+    "km": ("Enter distance of {} in kilometers", float),
+}
+
 @click.command()
 @click.argument("exercise_type")
 @click.option("--date", "-d", default=None, help="Date for the entry (YYYY-MM-DD). Defaults to today.")
@@ -32,6 +37,7 @@ def add(exercise_type, date, reps, time, distance, weight, sets, custom):
     data = load_data()
 
     # Handle custom exercise type
+    added_type = False
     if custom and exercise_type not in data["exercise_types"]:
         # Ask for unit type
         unit_options = ["reps", "seconds", "km"]
@@ -56,14 +62,14 @@ def add(exercise_type, date, reps, time, distance, weight, sets, custom):
             "muscle_groups": muscle_groups
         }
 
+        added_type = True
         click.echo(f"Added new exercise type: {exercise_type}")
 
     # Check if exercise type exists
     if exercise_type not in data["exercise_types"]:
         click.echo(f"Exercise type '{exercise_type}' not found.")
         click.echo("Available exercise types:")
-        for ex_type in data["exercise_types"]:
-            click.echo(f"- {ex_type}")
+        click.echo("\n".join(f"- {ex_type}" for ex_type in data["exercise_types"]))
         click.echo("To add a custom exercise type, use the --custom flag.")
         return
 
@@ -71,22 +77,12 @@ def add(exercise_type, date, reps, time, distance, weight, sets, custom):
     unit = data["exercise_types"][exercise_type]["unit"]
 
     # Determine the amount based on the unit
-    amount = None
-    if unit == "reps" and reps is not None:
-        amount = reps
-    elif unit == "seconds" and time is not None:
-        amount = time
-    elif unit == "km" and distance is not None:
-        amount = distance
+    amount = {"reps": reps, "seconds": time, "km": distance}.get(unit)
 
     # If amount is not provided, prompt the user
-    if amount is None:
-        if unit == "reps":
-            amount = click.prompt(f"Enter number of {exercise_type} repetitions", type=int)
-        elif unit == "seconds":
-            amount = click.prompt(f"Enter duration of {exercise_type} in seconds", type=int)
-        elif unit == "km":
-            amount = click.prompt(f"Enter distance of {exercise_type} in kilometers", type=float)
+    if amount is None and unit in _UNIT_PROMPT:
+        message, value_type = _UNIT_PROMPT[unit]
+        amount = click.prompt(message.format(exercise_type), type=value_type)
 
     # Add to data file
     if date not in data["entries"]:
@@ -111,6 +107,7 @@ def add(exercise_type, date, reps, time, distance, weight, sets, custom):
         entry_sets = click.prompt(f"Enter number of sets for {exercise_type}", type=int, default=1)
 
     # Create entry
+    import datetime
     entry = {
         "exercise_type": exercise_type,
         "amount": amount,
@@ -120,41 +117,41 @@ def add(exercise_type, date, reps, time, distance, weight, sets, custom):
         "timestamp": datetime.datetime.now().strftime("%H:%M:%S")
     }
     data["entries"][date].append(entry)
-    save_data(data)
+    if added_type:
+        # A new exercise type has to go into the data file itself
+        save_data(data)
+    else:
+        append_entry(data, date, entry)
 
     # Display confirmation
     formatted_amount = format_exercise_amount(amount, unit)
     weight_str = f" with {entry_weight}kg" if entry_weight > 0 else ""
     sets_str = f" x{entry_sets}" if entry_sets > 1 else ""
-    click.echo(f"Added {exercise_type}: {formatted_amount}{sets_str}{weight_str} for {date}")
+    lines = [f"Added {exercise_type}: {formatted_amount}{sets_str}{weight_str} for {date}"]
 
     # Calculate total weight if applicable
     total_weight = amount * entry_weight * entry_sets
     if total_weight > 0:
-        click.echo(f"Total weight lifted: {total_weight}kg")
+        lines.append(f"Total weight lifted: {total_weight}kg")
 
     # Check if there's a goal for this exercise type
     if exercise_type in data["goals"]:
         daily_goal = data["goals"][exercise_type].get("daily", 0)
         if daily_goal > 0:
             # Calculate total for today
-            total_reps = 0
-            total_weight_lifted = 0
-            for entry in data["entries"].get(date, []):
-                if entry["exercise_type"] == exercise_type:
-                    entry_amount = entry["amount"]
-                    entry_weight = entry.get("weight", 0)
-                    entry_sets = entry.get("sets", 1)
-                    total_reps += entry_amount * entry_sets
-                    total_weight_lifted += entry_amount * entry_weight * entry_sets
+            rows = [e for e in data["entries"].get(date, []) if e["exercise_type"] == exercise_type]
+            total_reps = sum(e["amount"] * e["sets"] for e in rows)
+            total_weight_lifted = sum(e["amount"] * e["weight"] * e["sets"] for e in rows)
 
             # Calculate progress
             goal_sets = data["goals"][exercise_type].get("sets", 1)
             progress = min(100, int((total_reps / (daily_goal * goal_sets)) * 100))
 
             # Display progress
-            click.echo(f"Progress towards daily goal: {progress}% ({total_reps}/{daily_goal * goal_sets} {unit})")
+            lines.append(f"Progress towards daily goal: {progress}% ({total_reps}/{daily_goal * goal_sets} {unit})")
 
             # Display total weight lifted if applicable
             if total_weight_lifted > 0:
-                click.echo(f"Total weight lifted today: {total_weight_lifted}kg")
+                lines.append(f"Total weight lifted today: {total_weight_lifted}kg")
+
+    click.echo("\n".join(lines))
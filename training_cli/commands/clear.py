@@ -4,7 +4,8 @@ Allows clearing exercise data.
 """
 import click
 import os
-from training_cli.utils.data import DATA_FILE, load_data, save_data
+from training_cli.utils.data import DATA_FILE, LOG_FILE, CACHE_FILE, load_data, save_data
+from training_cli.utils.cache import AGGREGATE_CACHE_FILE
 
 @click.command()
 @click.option("--all", "clear_all", is_flag=True, help="Clear all data including exercise types and goals.")
@@ -23,12 +24,18 @@ def clear(clear_all, date, exercise, goals, force):
             click.echo("Operation cancelled.")
             return
         
-        # Delete the data file
-        if os.path.exists(DATA_FILE):
+        # Delete the entry log and caches, then the data file itself
+        for path in (LOG_FILE, CACHE_FILE, AGGREGATE_CACHE_FILE):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        try:
             os.remove(DATA_FILE)
-            click.echo("All data has been cleared.")
-        else:
+        except FileNotFoundError:
             click.echo("No data file found.")
+        else:
+            click.echo("All data has been cleared.")
         return
     
     # Handle clearing goals
@@ -37,6 +44,10 @@ def clear(clear_all, date, exercise, goals, force):
             click.echo("Operation cancelled.")
             return
         
+        # Store each goal in history before clearing, as deleting a single goal does
+        for exercise_type, goal_data in data["goals"].items():
+            data["goal_history"].setdefault(exercise_type, []).append(goal_data.copy())
+        
         data["goals"] = {}
         save_data(data)
         click.echo("All goals have been cleared.")
@@ -52,9 +63,10 @@ def clear(clear_all, date, exercise, goals, force):
                     return
                 
                 # Filter out entries for the specified exercise
+                target = exercise.casefold()
                 data["entries"][date] = [
                     entry for entry in data["entries"][date]
-                    if entry["exercise_type"].lower() != exercise.lower()
+                    if entry["exercise_type"].casefold() != target
                 ]
                 
                 # Remove the date entry if it's empty
@@ -83,20 +95,24 @@ def clear(clear_all, date, exercise, goals, force):
             return
         
         # Filter out entries for the specified exercise from all dates
+        target = exercise.casefold()
         modified = False
-        for date in list(data["entries"].keys()):
-            original_count = len(data["entries"][date])
-            data["entries"][date] = [
-                entry for entry in data["entries"][date]
-                if entry["exercise_type"].lower() != exercise.lower()
+        for date, entries in list(data["entries"].items()):
+            kept = [
+                entry for entry in entries
+                if entry["exercise_type"].casefold() != target
             ]
             
+            # Leave dates without a matching entry untouched
+            if len(kept) == len(entries):
+                continue
+            modified = True
+            
             # Remove the date entry if it's empty
-            if not data["entries"][date]:
+            if kept:
+                data["entries"][date] = kept
+            else:
                 del data["entries"][date]
-            
-            if len(data["entries"].get(date, [])) != original_count:
-                modified = True
         
         if modified:
             save_data(data)
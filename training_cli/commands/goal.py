@@ -3,9 +3,8 @@ Goal command for the Training CLI application.
 Allows setting goals for different exercise types.
 """
 import click
-from tabulate import tabulate
 from training_cli.utils.data import load_data, save_data
-from training_cli.utils.helpers import get_today_date
+from training_cli.utils.helpers import get_today_date, goal_delta
 
 @click.command()
 @click.argument("exercise_type", required=False)
@@ -18,6 +17,7 @@ from training_cli.utils.helpers import get_today_date
 def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
     """Set, view, or delete goals for your exercises."""
     data = load_data()
+    dirty = False
 
     # List all goals if requested
     if list_goals or (exercise_type is None and daily is None and weekly is None and sets is None and weight is None and not delete):
@@ -49,6 +49,7 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
             table_data.append([ex_type, daily_goal, weekly_goal, sets_count, weight_amount, effective_date])
 
         # Display table
+        from tabulate import tabulate
         headers = ["Exercise Type", "Daily Goal", "Weekly Goal", "Sets", "Weight", "Effective Date"]
         click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
         return
@@ -62,8 +63,7 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
     if exercise_type not in data["exercise_types"]:
         click.echo(f"Exercise type '{exercise_type}' not found.")
         click.echo("Available exercise types:")
-        for ex_type in data["exercise_types"]:
-            click.echo(f"- {ex_type}")
+        click.echo("\n".join(f"- {ex_type}" for ex_type in data["exercise_types"]))
         return
 
     # Handle delete flag
@@ -90,6 +90,7 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
             "weight": 0,
             "effective_date": get_today_date()
         }
+        dirty = True
 
     # Check if we need to store goal history
     goal_changed = False
@@ -123,6 +124,7 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
 
     # Update effective date and store goal history if any goal was changed
     if goal_changed:
+        dirty = True
         today = get_today_date()
         data["goals"][exercise_type]["effective_date"] = today
 
@@ -130,9 +132,9 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
         if exercise_type not in data["goal_history"]:
             data["goal_history"][exercise_type] = []
 
-        # Store the previous goal in history
+        # Store the fields the change replaced in history
         if current_goal:
-            data["goal_history"][exercise_type].append(current_goal)
+            data["goal_history"][exercise_type].append(goal_delta(current_goal, data["goals"][exercise_type]))
 
     # If no goals were provided, show current goals for this exercise type
     if daily is None and weekly is None and sets is None and weight is None and not delete:
@@ -142,29 +144,33 @@ def goal(exercise_type, daily, weekly, sets, weight, list_goals, delete):
 
         goal_data = data["goals"][exercise_type]
         unit = data["exercise_types"][exercise_type]["unit"]
+        lines = []
 
         if "daily" in goal_data:
-            click.echo(f"Daily goal for {exercise_type}: {goal_data['daily']} {unit}")
+            lines.append(f"Daily goal for {exercise_type}: {goal_data['daily']} {unit}")
         else:
-            click.echo(f"No daily goal set for {exercise_type}.")
+            lines.append(f"No daily goal set for {exercise_type}.")
 
         if "weekly" in goal_data:
-            click.echo(f"Weekly goal for {exercise_type}: {goal_data['weekly']} {unit}")
+            lines.append(f"Weekly goal for {exercise_type}: {goal_data['weekly']} {unit}")
         else:
-            click.echo(f"No weekly goal set for {exercise_type}.")
+            lines.append(f"No weekly goal set for {exercise_type}.")
 
         if "sets" in goal_data:
-            click.echo(f"Sets for {exercise_type}: {goal_data['sets']}")
+            lines.append(f"Sets for {exercise_type}: {goal_data['sets']}")
         else:
-            click.echo(f"No sets set for {exercise_type}.")
+            lines.append(f"No sets set for {exercise_type}.")
 
         if "weight" in goal_data:
-            click.echo(f"Weight for {exercise_type}: {goal_data['weight']} kg")
+            lines.append(f"Weight for {exercise_type}: {goal_data['weight']} kg")
         else:
-            click.echo(f"No weight set for {exercise_type}.")
+            lines.append(f"No weight set for {exercise_type}.")
 
         if "effective_date" in goal_data:
-            click.echo(f"Effective date: {goal_data['effective_date']}")
+            lines.append(f"Effective date: {goal_data['effective_date']}")
+
+        click.echo("\n".join(lines))
 
     # Save changes
-    save_data(data)
+    if dirty:
+        save_data(data)
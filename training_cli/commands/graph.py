@@ -2,13 +2,174 @@
 Graph command for the Training CLI application.
 Allows visualizing exercise data.
 """
+import bisect
 import click
-import datetime
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from collections import defaultdict
+import numpy as np
 from training_cli.utils.data import load_data
-from training_cli.utils.helpers import get_today_date, validate_date
+from training_cli.utils.helpers import get_today_date, validate_date, expand_goal_history
+
+# Compare lines with more points than this are downsampled before plotting
+LTTB_THRESHOLD = 500
+
+# How each metric is named in "no data" messages
+METRIC_NAMES = {"reps": "repetition", "weight": "weight", "weight_per_rep": "weight per rep"}
+
+def _build_arrays(data, date_range):
+    """
+    Total every exercise type for each day of a date range with NumPy.
+
+    Entries in the range are flattened once into parallel arrays and summed per
+    (day, exercise type) cell with np.bincount.
+
+    Args:
+        data (dict): The loaded training data
+        date_range (list): The dates (YYYY-MM-DD) to aggregate
+
+    Returns:
+        tuple: (exercise_types, type_ids, reps, weights) where exercise_types lists
+            the exercise types with entries in the range in first-seen order,
+            type_ids maps each type to its column, and reps and weights are
+            (days x types) arrays of daily totals
+    """
+    exercise_types = []
+    type_ids = {}
+    date_idx = []
+    type_idx = []
+    amounts = []
+    weights = []
+    sets = []
+    entries_map = data["entries"]
+    for i, date in enumerate(date_range):
+        entries = entries_map.get(date)
+        if not entries:
+            continue
+        for entry in entries:
+            ex_type = entry["exercise_type"]
+            type_id = type_ids.get(ex_type)
+            if type_id is None:
+                type_id = type_ids[ex_type] = len(exercise_types)
+                exercise_types.append(ex_type)
+            date_idx.append(i)
+            type_idx.append(type_id)
+            amounts.append(entry["amount"])
+            weights.append(entry["weight"])
+            sets.append(entry["sets"])
+
+    num_days = len(date_range)
+    num_types = len(exercise_types)
+    cells = np.asarray(date_idx, dtype=np.intp) * num_types + np.asarray(type_idx, dtype=np.intp)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    sets = np.asarray(sets, dtype=np.float64)
+
+    def daily(values):
+        return np.bincount(cells, weights=values, minlength=num_days * num_types).reshape(num_days, num_types)
+
+    return exercise_types, type_ids, daily(amounts * sets), daily(amounts * weights * sets)
+
+def _metric_values(metric, reps, weights):
+    """
+    Select or derive the values of a metric from rep and weight totals.
+
+    Works element-wise, so it can be applied to a whole (days x types) array
+    at once.
+
+    Args:
+        metric (str): "reps", "weight" or "weight_per_rep"
+        reps (ndarray): Total reps
+        weights (ndarray): Total weight
+
+    Returns:
+        ndarray: The metric values; weight per rep is 0 where there are no reps
+    """
+    if metric == "reps":
+        return reps
+    if metric == "weight":
+        return weights
+    # Avoid division by zero
+    return np.divide(weights, reps, out=np.zeros(reps.shape), where=reps > 0)
+
+def _lttb(x, y, n_out):
+    """
+    Downsample a line with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves the visual shape.
+
+    Args:
+        x (ndarray): The x values as numbers, in ascending order
+        y (ndarray): The y values
+        n_out (int): The number of points to keep
+
+    Returns:
+        tuple: (x, y) arrays of the kept points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    x_num = x.astype(np.float64)
+    y_num = y.astype(np.float64)
+    bucket_size = (n - 2) / (n_out - 2)
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+
+        # Average of the next bucket (the last point for the final bucket)
+        avg_x = x_num[end:next_end].mean()
+        avg_y = y_num[end:next_end].mean()
+
+        # Twice the triangle area for each candidate point in this bucket
+        areas = np.abs((x_num[a] - avg_x) * (y_num[start:end] - y_num[a])
+                       - (x_num[a] - x_num[start:end]) * (avg_y - y_num[a]))
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+
+    return x[kept], y[kept]
+
+def _create_figure(output):
+    """
+    Create the figure and axes for a graph.
+
+    Figures that are only saved are built directly so they never enter
+    pyplot's figure registry; pyplot is only needed to display a window.
+
+    Args:
+        output (str): The file the graph will be saved to, or None to display it
+
+    Returns:
+        tuple: (figure, axes)
+    """
+    if output:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(12, 6))
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(12, 6))
+    return fig, fig.subplots()
+
+def _save_or_show(fig, output):
+    """
+    Save the figure to a file, or display it if no output file was given.
+
+    Args:
+        fig (Figure): The figure to save or display
+        output (str): The file to save the graph to, or None to display it
+    """
+    if output:
+        fig.savefig(output)
+        click.echo(f"Graph saved to {output}")
+    else:
+        import matplotlib.pyplot as plt
+        fig.tight_layout()
+        plt.show()
 
 @click.command()
 @click.option("--exercise", "-e", help="Exercise type to graph.")
@@ -23,37 +184,30 @@ def graph(exercise, days, month, compare, output, metric):
     data = load_data()
 
     # Determine the date range
-    end_date = datetime.datetime.strptime(get_today_date(), "%Y-%m-%d")
+    end_date = np.datetime64(get_today_date(), "D")
 
     if month:
         # Start from the beginning of the month
-        start_date = end_date.replace(day=1)
+        start_date = end_date.astype("datetime64[M]").astype("datetime64[D]")
     else:
         # Start from 'days' days ago
-        start_date = end_date - datetime.timedelta(days=days-1)
+        start_date = end_date - (days - 1)
 
     # Format dates as strings
-    start_date_str = start_date.strftime("%Y-%m-%d")
-    end_date_str = end_date.strftime("%Y-%m-%d")
-
-    # Get all dates in the range
-    date_range = []
-    date_objects = []
-    current_date = start_date
-    while current_date <= end_date:
-        date_range.append(current_date.strftime("%Y-%m-%d"))
-        date_objects.append(current_date)
-        current_date += datetime.timedelta(days=1)
+    start_date_str = str(start_date)
+    end_date_str = str(end_date)
+
+    # Get all dates in the range; matplotlib converts a datetime64 array in one go
+    # and NumPy renders day-resolution dates as YYYY-MM-DD without strftime
+    date_objects = np.arange(start_date, end_date + 1)
+    date_range = date_objects.astype(str).tolist()
+
+    # Total every exercise type per day once; all branches below read from this
+    exercise_types, type_ids, day_reps, day_weights = _build_arrays(data, date_range)
+    sorted_types = sorted(exercise_types)
 
     # If comparing multiple exercise types
     if compare:
-        # Get all exercise types with data in the date range
-        exercise_types = set()
-        for date in date_range:
-            if date in data["entries"]:
-                for entry in data["entries"][date]:
-                    exercise_types.add(entry["exercise_type"])
-
         if not exercise_types:
             click.echo("No exercise data found in the selected date range.")
             return
@@ -61,202 +215,146 @@ def graph(exercise, days, month, compare, output, metric):
         # Ask user to select exercise types to compare
         if not exercise:
             click.echo("Select exercise types to compare:")
-            for i, ex_type in enumerate(sorted(exercise_types), 1):
+            for i, ex_type in enumerate(sorted_types, 1):
                 click.echo(f"{i}. {ex_type}")
 
             selected = click.prompt("Enter numbers separated by commas (or 'all' for all types)", default="all")
 
             if selected.lower() == "all":
-                selected_types = sorted(exercise_types)
+                selected_types = sorted_types
             else:
                 try:
                     indices = [int(idx.strip()) - 1 for idx in selected.split(",")]
-                    selected_types = [sorted(exercise_types)[idx] for idx in indices if 0 <= idx < len(exercise_types)]
+                    selected_types = [sorted_types[idx] for idx in indices if 0 <= idx < len(sorted_types)]
                 except ValueError:
                     click.echo("Invalid input. Using all exercise types.")
-                    selected_types = sorted(exercise_types)
+                    selected_types = sorted_types
         else:
             # Use the specified exercise type and find similar ones
-            selected_types = [ex_type for ex_type in exercise_types if exercise.lower() in ex_type.lower()]
+            exercise_lower = exercise.lower()
+            selected_types = [ex_type for ex_type in exercise_types if exercise_lower in ex_type.lower()]
             if not selected_types:
                 click.echo(f"No data found for exercise types containing '{exercise}'.")
                 return
 
-        # Collect data for each selected exercise type
+        # Collect data for each selected exercise type from the metric computed for all types at once
+        metric_totals = _metric_values(metric, day_reps, day_weights)
         exercise_data = {}
         for ex_type in selected_types:
-            daily_totals = []
-            for date in date_range:
-                total_reps = 0
-                total_weight = 0
-                total_sets = 0
-                if date in data["entries"]:
-                    for entry in data["entries"][date]:
-                        if entry["exercise_type"] == ex_type:
-                            amount = entry["amount"]
-                            weight = entry.get("weight", 0)
-                            sets = entry.get("sets", 1)
-                            total_reps += amount * sets
-                            total_weight += amount * weight * sets
-                            total_sets += sets
-
-                # Determine which metric to use
-                if metric == "reps":
-                    daily_totals.append(total_reps)
-                elif metric == "weight":
-                    daily_totals.append(total_weight)
-                elif metric == "weight_per_rep":
-                    # Avoid division by zero
-                    if total_reps > 0:
-                        daily_totals.append(total_weight / total_reps)
-                    else:
-                        daily_totals.append(0)
-
-            exercise_data[ex_type] = daily_totals
-
-        # Create the graph
-        plt.figure(figsize=(12, 6))
-
-        # Plot data for each exercise type
+            daily_totals = metric_totals[:, type_ids[ex_type]]
+
+            # Skip series with nothing to draw
+            if daily_totals.any():
+                exercise_data[ex_type] = daily_totals
+
+        # Bail out before touching matplotlib if every series is empty
+        if not exercise_data:
+            click.echo(f"No {METRIC_NAMES[metric]} data found for the selected exercise types in the selected date range.")
+            return
+
+        # Create the graph; matplotlib is only imported once there is something to plot
+        import matplotlib.dates as mdates
+        fig, ax = _create_figure(output)
+
+        # Plot data for each exercise type, downsampling long ranges
+        date_ordinals = date_objects.astype(np.int64)
         for ex_type, totals in exercise_data.items():
-            plt.plot(date_objects, totals, marker='o', label=ex_type)
+            if len(totals) > LTTB_THRESHOLD:
+                xs, ys = _lttb(date_ordinals, totals, LTTB_THRESHOLD)
+                ax.plot(xs.astype("datetime64[D]"), ys, marker='o', label=ex_type)
+            else:
+                ax.plot(date_objects, totals, marker='o', label=ex_type)
 
         # Add labels and title
-        plt.xlabel("Date")
+        ax.set_xlabel("Date")
 
         # Set y-label based on metric
         if metric == "reps":
-            plt.ylabel("Repetitions")
-            plt.title(f"Exercise Comparison - Repetitions ({start_date_str} to {end_date_str})")
+            ax.set_ylabel("Repetitions")
+            ax.set_title(f"Exercise Comparison - Repetitions ({start_date_str} to {end_date_str})")
         elif metric == "weight":
-            plt.ylabel("Total Weight (kg)")
-            plt.title(f"Exercise Comparison - Total Weight ({start_date_str} to {end_date_str})")
+            ax.set_ylabel("Total Weight (kg)")
+            ax.set_title(f"Exercise Comparison - Total Weight ({start_date_str} to {end_date_str})")
         elif metric == "weight_per_rep":
-            plt.ylabel("Weight per Rep (kg)")
-            plt.title(f"Exercise Comparison - Weight per Rep ({start_date_str} to {end_date_str})")
-        plt.legend()
+            ax.set_ylabel("Weight per Rep (kg)")
+            ax.set_title(f"Exercise Comparison - Weight per Rep ({start_date_str} to {end_date_str})")
+        ax.legend()
 
-        # Format x-axis dates
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-        plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(date_range)//10)))
-        plt.gcf().autofmt_xdate()
+        # Format x-axis dates; the locator picks day/month/year ticks to suit the range
+        locator = mdates.AutoDateLocator(minticks=5, maxticks=10)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
 
         # Add grid
-        plt.grid(True, linestyle='--', alpha=0.7)
+        ax.grid(True, linestyle='--', alpha=0.7)
 
         # Save or show the graph
-        if output:
-            plt.savefig(output)
-            click.echo(f"Graph saved to {output}")
-        else:
-            plt.tight_layout()
-            plt.show()
+        _save_or_show(fig, output)
 
         return
 
     # Single exercise type graph
     if not exercise:
-        # Get all exercise types with data in the date range
-        exercise_types = set()
-        for date in date_range:
-            if date in data["entries"]:
-                for entry in data["entries"][date]:
-                    exercise_types.add(entry["exercise_type"])
-
         if not exercise_types:
             click.echo("No exercise data found in the selected date range.")
             return
 
         # Ask user to select an exercise type
         click.echo("Select an exercise type to graph:")
-        for i, ex_type in enumerate(sorted(exercise_types), 1):
+        for i, ex_type in enumerate(sorted_types, 1):
             click.echo(f"{i}. {ex_type}")
 
         selection = click.prompt("Enter the number of your choice", type=int, default=1)
         if selection < 1 or selection > len(exercise_types):
             click.echo("Invalid selection. Using the first exercise type.")
-            exercise = sorted(exercise_types)[0]
+            exercise = sorted_types[0]
         else:
-            exercise = sorted(exercise_types)[selection - 1]
+            exercise = sorted_types[selection - 1]
 
     # Collect data for the selected exercise type
-    daily_totals = []
-    daily_weights = []
-    daily_weight_per_rep = []
-
-    for date in date_range:
-        total_reps = 0
-        total_weight = 0
-        total_sets = 0
-        if date in data["entries"]:
-            for entry in data["entries"][date]:
-                if entry["exercise_type"].lower() == exercise.lower():
-                    amount = entry["amount"]
-                    weight = entry.get("weight", 0)
-                    sets = entry.get("sets", 1)
-                    total_reps += amount * sets
-                    total_weight += amount * weight * sets
-                    total_sets += sets
-
-        daily_totals.append(total_reps)
-        daily_weights.append(total_weight)
-        # Avoid division by zero
-        if total_reps > 0:
-            daily_weight_per_rep.append(total_weight / total_reps)
-        else:
-            daily_weight_per_rep.append(0)
-
-    # Determine which data to use based on metric
-    if metric == "reps":
-        plot_data = daily_totals
-        if sum(plot_data) == 0:
-            click.echo(f"No repetition data found for '{exercise}' in the selected date range.")
-            return
-    elif metric == "weight":
-        plot_data = daily_weights
-        if sum(plot_data) == 0:
-            click.echo(f"No weight data found for '{exercise}' in the selected date range.")
-            return
-    elif metric == "weight_per_rep":
-        plot_data = daily_weight_per_rep
-        if sum(plot_data) == 0:
-            click.echo(f"No weight per rep data found for '{exercise}' in the selected date range.")
-            return
+    # Case variants of the exercise name share a graph; exercise_types holds each stored name once
+    exercise_lower = exercise.lower()
+    columns = [type_ids[ex_type] for ex_type in exercise_types if ex_type.lower() == exercise_lower]
+    plot_data = _metric_values(metric, day_reps[:, columns].sum(axis=1), day_weights[:, columns].sum(axis=1))
+    if plot_data.sum() == 0:
+        click.echo(f"No {METRIC_NAMES[metric]} data found for '{exercise}' in the selected date range.")
+        return
 
     # Get the unit for this exercise type
     unit = data["exercise_types"].get(exercise, {}).get("unit", "reps")
 
-    # Create the graph
-    plt.figure(figsize=(12, 6))
+    # Create the graph; matplotlib is only imported once there is something to plot
+    import matplotlib.dates as mdates
+    fig, ax = _create_figure(output)
 
     # Plot the data
-    plt.bar(date_objects, plot_data, color='skyblue')
+    ax.bar(date_objects, plot_data, color='skyblue')
 
     # Add labels and title
-    plt.xlabel("Date")
+    ax.set_xlabel("Date")
 
     # Set y-label and title based on metric
     if metric == "reps":
-        plt.ylabel(f"Repetitions ({unit})")
-        plt.title(f"{exercise.capitalize()} - Repetitions ({start_date_str} to {end_date_str})")
+        ax.set_ylabel(f"Repetitions ({unit})")
+        ax.set_title(f"{exercise.capitalize()} - Repetitions ({start_date_str} to {end_date_str})")
     elif metric == "weight":
-        plt.ylabel("Total Weight (kg)")
-        plt.title(f"{exercise.capitalize()} - Total Weight ({start_date_str} to {end_date_str})")
+        ax.set_ylabel("Total Weight (kg)")
+        ax.set_title(f"{exercise.capitalize()} - Total Weight ({start_date_str} to {end_date_str})")
     elif metric == "weight_per_rep":
-        plt.ylabel("Weight per Rep (kg)")
-        plt.title(f"{exercise.capitalize()} - Weight per Rep ({start_date_str} to {end_date_str})")
+        ax.set_ylabel("Weight per Rep (kg)")
+        ax.set_title(f"{exercise.capitalize()} - Weight per Rep ({start_date_str} to {end_date_str})")
 
-    # Format x-axis dates
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-    plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(date_range)//10)))
-    plt.gcf().autofmt_xdate()
+    # Format x-axis dates; the locator picks day/month/year ticks to suit the range
+    locator = mdates.AutoDateLocator(minticks=5, maxticks=10)
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
 
     # Add goal line if applicable
     if exercise in data["goals"]:
         goal_data = data["goals"][exercise]
 
         # Get goal history for this exercise
-        goal_history = data.get("goal_history", {}).get(exercise, [])
+        goal_history = expand_goal_history(data.get("goal_history", {}).get(exercise, []), goal_data)
 
         # Add current goal to history for processing
         all_goals = goal_history + [goal_data]
@@ -264,48 +362,37 @@ def graph(exercise, days, month, compare, output, metric):
         # Sort goals by effective date
         all_goals.sort(key=lambda g: g.get("effective_date", "2023-01-01"))
 
-        # Find applicable goals for each date in the range
-        for i, date_obj in enumerate(date_objects):
-            date_str = date_obj.strftime("%Y-%m-%d")
-
-            # Find the most recent goal that was effective before or on this date
-            applicable_goal = None
-            for goal in all_goals:
-                effective_date = goal.get("effective_date", "2023-01-01")
-                if effective_date <= date_str:
-                    applicable_goal = goal
-
-            if applicable_goal and i == 0:  # Only add the line once
-                if metric == "reps" and "daily" in applicable_goal:
-                    daily_goal = applicable_goal["daily"]
-                    sets = applicable_goal.get("sets", 1)
-                    total_goal = daily_goal * sets
-                    plt.axhline(y=total_goal, color='r', linestyle='--', 
-                                label=f"Daily Goal ({daily_goal} {unit} x{sets})")
-                    plt.legend()
-                elif metric == "weight" and "daily" in applicable_goal:
-                    daily_goal = applicable_goal["daily"]
-                    sets = applicable_goal.get("sets", 1)
-                    weight = applicable_goal.get("weight", 0)
-                    if weight > 0:
-                        total_weight_goal = daily_goal * sets * weight
-                        plt.axhline(y=total_weight_goal, color='r', linestyle='--', 
-                                    label=f"Daily Weight Goal ({total_weight_goal}kg)")
-                        plt.legend()
-                elif metric == "weight_per_rep" and "daily" in applicable_goal:
-                    weight = applicable_goal.get("weight", 0)
-                    if weight > 0:
-                        plt.axhline(y=weight, color='r', linestyle='--', 
-                                    label=f"Weight per Rep Goal ({weight}kg)")
-                        plt.legend()
+        # The line shows the most recent goal effective on the first day of the range
+        effective_dates = [goal.get("effective_date", "2023-01-01") for goal in all_goals]
+        idx = bisect.bisect_right(effective_dates, start_date_str) - 1
+        applicable_goal = all_goals[idx] if idx >= 0 else None
+
+        if applicable_goal:
+            if metric == "reps" and "daily" in applicable_goal:
+                daily_goal = applicable_goal["daily"]
+                sets = applicable_goal.get("sets", 1)
+                total_goal = daily_goal * sets
+                ax.axhline(y=total_goal, color='r', linestyle='--', 
+                           label=f"Daily Goal ({daily_goal} {unit} x{sets})")
+                ax.legend()
+            elif metric == "weight" and "daily" in applicable_goal:
+                daily_goal = applicable_goal["daily"]
+                sets = applicable_goal.get("sets", 1)
+                weight = applicable_goal.get("weight", 0)
+                if weight > 0:
+                    total_weight_goal = daily_goal * sets * weight
+                    ax.axhline(y=total_weight_goal, color='r', linestyle='--', 
+                               label=f"Daily Weight Goal ({total_weight_goal}kg)")
+                    ax.legend()
+            elif metric == "weight_per_rep" and "daily" in applicable_goal:
+                weight = applicable_goal.get("weight", 0)
+                if weight > 0:
+                    ax.axhline(y=weight, color='r', linestyle='--', 
+                               label=f"Weight per Rep Goal ({weight}kg)")
+                    ax.legend()
 
     # Add grid
-    plt.grid(True, linestyle='--', alpha=0.7)
+    ax.grid(True, linestyle='--', alpha=0.7)
 
     # Save or show the graph
-    if output:
-        plt.savefig(output)
-        click.echo(f"Graph saved to {output}")
-    else:
-        plt.tight_layout()
-        plt.show()
+    _save_or_show(fig, output)
@@ -2,11 +2,155 @@
 List command for the Training CLI application.
 Allows listing exercise entries and viewing progress.
 """
+import bisect
 import click
 import datetime
-from tabulate import tabulate
-from training_cli.utils.data import load_data
-from training_cli.utils.helpers import get_today_date, validate_date, calculate_total_by_exercise, calculate_progress, format_exercise_amount, create_progress_bar
+import functools
+import unicodedata
+from training_cli.utils.cache import load_data_cached
+from training_cli.utils.helpers import get_today_date, validate_date, calculate_totals_for_dates, calculate_progress, format_exercise_amount, create_progress_bar
+
+def _display_width(text):
+    """Return the number of terminal columns text takes up."""
+    if text.isascii():
+        return len(text)
+    return sum(
+        0 if unicodedata.combining(char) else 2 if unicodedata.east_asian_width(char) in "WF" else 1
+        for char in text
+    )
+
+def _render_table(headers, rows):
+    """
+    Render text rows in the layout of tabulate's "simple" format.
+
+    Cells are left-aligned and padded to their display width, so wide characters
+    in custom exercise names take two columns, and each column is at least two
+    characters wider than its header, like tabulate does. Unlike tabulate, cells
+    that look like numbers (e.g. an exercise named "1e3") are printed as they are
+    and left-aligned like every other cell.
+    """
+    rows = [[str(cell).strip() for cell in row] for row in rows]
+    widths = [_display_width(header) + 2 for header in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            width = _display_width(cell)
+            if width > widths[i]:
+                widths[i] = width
+
+    def render_row(cells):
+        return "  ".join(cell + " " * (width - _display_width(cell)) for cell, width in zip(cells, widths)).rstrip()
+
+    lines = [render_row(headers), "  ".join("-" * width for width in widths)]
+    lines.extend(render_row(row) for row in rows)
+    return "\n".join(lines)
+
+def _combined_totals(per_date_totals, dates, exercise_lower=None):
+    """
+    Merge the cached per-date totals of the given dates.
+
+    Args:
+        per_date_totals (dict): Date -> totals by exercise type, from the aggregate cache
+        dates (iterable): The dates to combine
+        exercise_lower (str): If given, only keep this lowercased exercise type
+
+    Returns:
+        dict: Totals by exercise type, as new dictionaries
+    """
+    totals = calculate_totals_for_dates(per_date_totals, dates)
+    if exercise_lower:
+        totals = {ex_type: total for ex_type, total in totals.items() if ex_type.lower() == exercise_lower}
+    return totals
+
+def _add_goal_rows(totals, goals, weekly_totals, is_last_day_of_week):
+    """
+    Add today's rows for exercises with goals that haven't been logged.
+
+    Exercises with only a weekly goal get a row carrying the week's totals while
+    that goal isn't met; exercises with a daily goal get a "not logged" row.
+
+    Args:
+        totals (dict): Today's totals by exercise type, updated in place
+        goals (dict): The current goals by exercise type
+        weekly_totals (dict): Totals by exercise type for the current week so far
+        is_last_day_of_week (bool): Whether today is the last day of the week
+    """
+    for ex_type, goal_data in goals.items():
+        # Check if this exercise has a weekly goal but no daily goal
+        if "weekly" in goal_data and ("daily" not in goal_data or goal_data["daily"] == 0):
+            weekly = weekly_totals.get(ex_type)
+            weekly_total = weekly["amount"] if weekly else 0
+
+            # If weekly goal has not been met, add it with the week's values
+            if weekly_total < goal_data["weekly"] * goal_data.get("sets", 1):
+                totals[ex_type] = {
+                    "amount": weekly_total,
+                    "weight_total": weekly["weight_total"] if weekly else 0,
+                    "sets_total": weekly["sets_total"] if weekly else 0,
+                    "weekly_goal_only": True,  # Flag to indicate this exercise has only a weekly goal
+                    "weekly_goal_met": False,  # Flag to indicate the weekly goal has not been met
+                    "is_last_day_of_week": is_last_day_of_week  # Flag to indicate if today is the last day of the week
+                }
+        elif ex_type not in totals:
+            # Initialize with zero values for exercises with daily goals
+            totals[ex_type] = {
+                "amount": 0,
+                "weight_total": 0,
+                "sets_total": 0,
+                "not_logged": True  # Flag to indicate this exercise hasn't been logged
+            }
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _format_total(not_logged, weekly_goal_only, is_last_day_of_week, amount, sets_total, weight_total, unit, detailed):
+    """Format a total from its individual fields; see _format_total_line."""
+    if not_logged:
+        return "Not logged"
+
+    formatted_amount = format_exercise_amount(amount, unit)
+    # Most totals are a single set without weight, which is just the amount
+    if not weekly_goal_only and (not detailed or (sets_total <= 1 and weight_total <= 0)):
+        return formatted_amount
+
+    parts = [formatted_amount]
+    if detailed:
+        # Add sets information if more than 1
+        if sets_total > 1:
+            parts.append(f" (in {sets_total} sets)")
+
+        # Add weight information if applicable
+        if weight_total > 0:
+            parts.append(f" - Total weight: {weight_total}kg")
+
+    # Add weekly goal notification
+    if weekly_goal_only:
+        if is_last_day_of_week:
+            parts.append(" (WEEKLY GOAL NOT MET - LAST DAY!)")
+        else:
+            parts.append(" (Weekly goal not met)")
+    return "".join(parts)
+
+def _format_total_line(total_data, unit, detailed=True):
+    """
+    Format an exercise's total for display.
+
+    Args:
+        total_data (dict): The totals for the exercise, including the not_logged,
+            weekly_goal_only and is_last_day_of_week flags when set
+        unit (str): The unit of the exercise
+        detailed (bool): Whether to include the sets and total weight
+
+    Returns:
+        str: The formatted total
+    """
+    return _format_total(
+        total_data.get("not_logged", False),
+        total_data.get("weekly_goal_only", False),
+        total_data.get("is_last_day_of_week", False),
+        total_data["amount"],
+        total_data["sets_total"],
+        total_data["weight_total"],
+        unit,
+        detailed,
+    )
 
 @click.command(name="list")
 @click.option("--date", "-d", default=None, help="Date to list entries for (YYYY-MM-DD). Defaults to today.")
@@ -16,23 +160,26 @@ from training_cli.utils.helpers import get_today_date, validate_date, calculate_
 @click.option("--summary", "-s", is_flag=True, help="Show only summary information.")
 def list_exercises(date, week, month, exercise, summary):
     """List your exercise entries and view progress."""
-    data = load_data()
+    data, cache = load_data_cached()
+    unit_by_type = {ex_type: info.get("unit", "reps") for ex_type, info in data["exercise_types"].items()}
 
     # Determine the date range to display
     today = get_today_date()
 
+    # Parse today once; the week and month views and the weekly goals all derive from it
+    today_date = datetime.date.fromisoformat(today)
+    weekday = today_date.weekday()
+    start_of_week_str = (today_date - datetime.timedelta(days=weekday)).isoformat()
+    today_is_last_day_of_week = weekday == 6  # 6 is Sunday
+
     if week:
-        # Calculate the start of the week (Monday)
-        today_date = datetime.datetime.strptime(today, "%Y-%m-%d")
-        start_of_week = today_date - datetime.timedelta(days=today_date.weekday())
-        start_date = start_of_week.strftime("%Y-%m-%d")
+        # The week starts on Monday
+        start_date = start_of_week_str
         end_date = today
         date_range_str = f"Week of {start_date} to {end_date}"
     elif month:
         # Calculate the start of the month
-        today_date = datetime.datetime.strptime(today, "%Y-%m-%d")
-        start_of_month = today_date.replace(day=1)
-        start_date = start_of_month.strftime("%Y-%m-%d")
+        start_date = today_date.replace(day=1).isoformat()
         end_date = today
         date_range_str = f"Month of {start_date} to {end_date}"
     elif date:
@@ -49,20 +196,22 @@ def list_exercises(date, week, month, exercise, summary):
         end_date = today
         date_range_str = "Today"
 
-    # Filter entries by date range
+    # Filter entries by date range, slicing the window out of the sorted entry dates
+    sorted_dates = cache["sorted_dates"]
+    exercise_lower = exercise.lower() if exercise else None
     filtered_entries = {}
-    for entry_date, entries in data["entries"].items():
-        if start_date <= entry_date <= end_date:
-            if exercise:
-                # Filter by exercise type if specified
-                filtered_entries[entry_date] = [
-                    entry for entry in entries
-                    if entry["exercise_type"].lower() == exercise.lower()
-                ]
-                # Skip dates with no matching entries
-                if not filtered_entries[entry_date]:
-                    del filtered_entries[entry_date]
-            else:
+    if exercise_lower:
+        # Only visit the dates that have the exercise, picking its entries by position
+        type_dates, type_positions = cache["type_index"].get(exercise_lower, ([], []))
+        first = bisect.bisect_left(type_dates, start_date)
+        last = bisect.bisect_right(type_dates, end_date)
+        for entry_date, positions in zip(type_dates[first:last], type_positions[first:last]):
+            entries = data["entries"][entry_date]
+            filtered_entries[entry_date] = [entries[position] for position in positions]
+    else:
+        for entry_date in sorted_dates[bisect.bisect_left(sorted_dates, start_date):bisect.bisect_right(sorted_dates, end_date)]:
+            entries = data["entries"][entry_date]
+            if entries:
                 filtered_entries[entry_date] = entries
 
     # Check if there are any entries to display
@@ -78,161 +227,82 @@ def list_exercises(date, week, month, exercise, summary):
                 click.echo("No entries found for the selected date range.")
             return
 
+    # Collect the output and write it in one go at the end
+    out = []
+
     # Display header
     if exercise:
-        click.echo(f"Exercise entries for '{exercise}' - {date_range_str}:")
+        out.append(f"Exercise entries for '{exercise}' - {date_range_str}:")
     else:
-        click.echo(f"Exercise entries - {date_range_str}:")
-
-    # Calculate totals by exercise type
-    all_totals = {}
-    for entry_date, entries in filtered_entries.items():
-        date_totals = calculate_total_by_exercise({entry_date: entries}, entry_date)
-        for ex_type, total in date_totals.items():
-            if ex_type in all_totals:
-                all_totals[ex_type]["amount"] += total["amount"]
-                all_totals[ex_type]["weight_total"] += total["weight_total"]
-                all_totals[ex_type]["sets_total"] += total["sets_total"]
-            else:
-                all_totals[ex_type] = total
+        out.append(f"Exercise entries - {date_range_str}:")
 
-    # If we're looking at today's data, add exercises with goals that haven't been logged
-    if start_date == end_date and end_date == today and not exercise:
-        # Check if today is the last day of the week (Sunday)
-        today_date = datetime.datetime.strptime(today, "%Y-%m-%d")
-        is_last_day_of_week = today_date.weekday() == 6  # 6 is Sunday
-
-        for ex_type, goal_data in data["goals"].items():
-            # Check if this exercise has a weekly goal but no daily goal
-            has_weekly_goal_only = "weekly" in goal_data and ("daily" not in goal_data or goal_data["daily"] == 0)
-
-            # If it has a weekly goal only, we need to check if the weekly goal has been met
-            if has_weekly_goal_only:
-                # Calculate the start of the week (Monday)
-                start_of_week = today_date - datetime.timedelta(days=today_date.weekday())
-                start_date_str = start_of_week.strftime("%Y-%m-%d")
-
-                # Calculate total for the week
-                weekly_total = 0
-                weekly_weight_total = 0
-                weekly_sets_total = 0
-
-                for date_str in data["entries"]:
-                    if start_date_str <= date_str <= today:
-                        for entry in data["entries"][date_str]:
-                            if entry["exercise_type"] == ex_type:
-                                amount = entry["amount"]
-                                weight = entry.get("weight", 0)
-                                sets = entry.get("sets", 1)
-                                weekly_total += amount * sets
-                                weekly_weight_total += amount * weight * sets
-                                weekly_sets_total += sets
-
-                # Check if weekly goal has been met
-                weekly_goal = goal_data["weekly"]
-                goal_sets = goal_data.get("sets", 1)
-                weekly_goal_met = weekly_total >= weekly_goal * goal_sets
-
-                # If weekly goal has not been met, add it to all_totals
-                if not weekly_goal_met:
-                    # Initialize with weekly values
-                    all_totals[ex_type] = {
-                        "amount": weekly_total,
-                        "weight_total": weekly_weight_total,
-                        "sets_total": weekly_sets_total,
-                        "weekly_goal_only": True,  # Flag to indicate this exercise has only a weekly goal
-                        "weekly_goal_met": False,  # Flag to indicate the weekly goal has not been met
-                        "is_last_day_of_week": is_last_day_of_week  # Flag to indicate if today is the last day of the week
-                    }
-            elif ex_type not in all_totals:
-                # Initialize with zero values for exercises with daily goals
-                all_totals[ex_type] = {
-                    "amount": 0,
-                    "weight_total": 0,
-                    "sets_total": 0,
-                    "not_logged": True  # Flag to indicate this exercise hasn't been logged
-                }
-
-    # Calculate progress towards goals
-    progress = calculate_progress(all_totals, data["goals"], week, month)
+    # Totals for the current week, for exercises that only have a weekly goal; needed
+    # whenever today's totals are shown
+    weekly_totals = {}
+    if start_date <= today <= end_date:
+        week_dates = sorted_dates[bisect.bisect_left(sorted_dates, start_of_week_str):bisect.bisect_right(sorted_dates, today)]
+        weekly_totals = calculate_totals_for_dates(cache["per_date_totals"], week_dates)
 
     # If summary mode, just show the totals and progress
     if summary:
+        all_totals = _combined_totals(cache["per_date_totals"], filtered_entries, exercise_lower)
+
+        # If we're looking at today's data, add exercises with goals that haven't been logged
+        if start_date == end_date and end_date == today and not exercise:
+            _add_goal_rows(all_totals, data["goals"], weekly_totals, today_is_last_day_of_week)
+
+        # Calculate progress towards goals
+        progress = calculate_progress(all_totals, data["goals"], week, month)
+
+        # The goal column only depends on the goals, so format it once per exercise type
+        goal_key = "weekly" if week else "daily"
+        goal_strs = {}
+        for ex_type, goal_data in data["goals"].items():
+            if goal_key in goal_data:
+                sets = goal_data.get("sets", 1)
+                weight = goal_data.get("weight", 0)
+                goal_str = f"{goal_data[goal_key]} {unit_by_type.get(ex_type, 'reps')}"
+                if sets > 1:
+                    goal_str += f" x{sets}"
+                if weight > 0:
+                    goal_str += f" ({weight}kg)"
+                goal_strs[ex_type] = (goal_str, weight)
+
         # Prepare summary table
         summary_data = []
         for ex_type, total in all_totals.items():
-            unit = data["exercise_types"].get(ex_type, {}).get("unit", "reps")
-            # Check if this exercise hasn't been logged or has a weekly goal only
-            not_logged = total.get("not_logged", False)
-            weekly_goal_only = total.get("weekly_goal_only", False)
-            is_last_day_of_week = total.get("is_last_day_of_week", False)
-
-            if not_logged:
-                formatted_total = "Not logged"
-            elif weekly_goal_only:
-                formatted_total = format_exercise_amount(total["amount"], unit)
-                if is_last_day_of_week:
-                    formatted_total += " (WEEKLY GOAL NOT MET - LAST DAY!)"
-                else:
-                    formatted_total += " (Weekly goal not met)"
-            else:
-                formatted_total = format_exercise_amount(total["amount"], unit)
+            unit = unit_by_type.get(ex_type, "reps")
+            formatted_total = _format_total_line(total, unit, detailed=False)
 
             # Get goal information
             goal_str = "-"
             progress_str = "-"
             progress_bar = ""
-            if ex_type in data["goals"]:
-                if week and "weekly" in data["goals"][ex_type]:
-                    goal = data["goals"][ex_type]["weekly"]
-                    sets = data["goals"][ex_type].get("sets", 1)
-                    weight = data["goals"][ex_type].get("weight", 0)
-                    goal_str = f"{goal} {unit}"
-                    if sets > 1:
-                        goal_str += f" x{sets}"
-                    if weight > 0:
-                        goal_str += f" ({weight}kg)"
-
-                    if ex_type in progress:
-                        progress_pct = progress[ex_type]["reps"]
-                        progress_str = f"{progress_pct}%"
-                        progress_bar = create_progress_bar(progress_pct)
-
-                        # Add weight progress if applicable
-                        if weight > 0 and progress[ex_type]["weight"] > 0:
-                            weight_pct = progress[ex_type]["weight"]
-                            progress_str += f" (Weight: {weight_pct}%)"
-
-                elif not week and "daily" in data["goals"][ex_type]:
-                    goal = data["goals"][ex_type]["daily"]
-                    sets = data["goals"][ex_type].get("sets", 1)
-                    weight = data["goals"][ex_type].get("weight", 0)
-                    goal_str = f"{goal} {unit}"
-                    if sets > 1:
-                        goal_str += f" x{sets}"
-                    if weight > 0:
-                        goal_str += f" ({weight}kg)"
-
-                    if ex_type in progress:
-                        progress_pct = progress[ex_type]["reps"]
-                        progress_str = f"{progress_pct}%"
-                        progress_bar = create_progress_bar(progress_pct)
-
-                        # Add weight progress if applicable
-                        if weight > 0 and progress[ex_type]["weight"] > 0:
-                            weight_pct = progress[ex_type]["weight"]
-                            progress_str += f" (Weight: {weight_pct}%)"
+            if ex_type in goal_strs:
+                goal_str, weight = goal_strs[ex_type]
+
+                if ex_type in progress:
+                    progress_pct = progress[ex_type]["reps"]
+                    progress_str = f"{progress_pct}%"
+                    progress_bar = create_progress_bar(progress_pct)
+
+                    # Add weight progress if applicable
+                    if weight > 0 and progress[ex_type]["weight"] > 0:
+                        weight_pct = progress[ex_type]["weight"]
+                        progress_str += f" (Weight: {weight_pct}%)"
 
             summary_data.append([ex_type, formatted_total, goal_str, progress_str, progress_bar])
 
         # Display summary table
         headers = ["Exercise Type", "Total", "Goal", "Progress", "Graph"]
-        click.echo(tabulate(summary_data, headers=headers, tablefmt="simple"))
+        out.append(_render_table(headers, summary_data))
+        click.echo("\n".join(out))
         return
 
     # Display detailed entries
-    for entry_date in sorted(filtered_entries.keys()):
-        click.echo(f"\nDate: {entry_date}")
+    # filtered_entries was built from the sorted dates, so it is already in date order
+    for entry_date in filtered_entries:
+        out.append(f"\nDate: {entry_date}")
 
         # Prepare table data for this date
         table_data = []
@@ -241,8 +311,8 @@ def list_exercises(date, week, month, exercise, summary):
             amount = entry["amount"]
             unit = entry["unit"]
             timestamp = entry.get("timestamp", "")
-            sets = entry.get("sets", 1)
-            weight = entry.get("weight", 0)
+            sets = entry["sets"]
+            weight = entry["weight"]
 
             formatted_amount = format_exercise_amount(amount, unit)
             if sets > 1:
@@ -253,106 +323,28 @@ def list_exercises(date, week, month, exercise, summary):
 
         # Display table for this date
         headers = ["Time", "Exercise", "Amount"]
-        click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
+        out.append(_render_table(headers, table_data))
 
         # Show totals for this date
-        date_totals = calculate_total_by_exercise({entry_date: filtered_entries[entry_date]}, entry_date)
+        date_totals = cache["per_date_totals"][entry_date]
+        if exercise_lower:
+            date_totals = {
+                ex_type: total for ex_type, total in date_totals.items()
+                if ex_type.lower() == exercise_lower
+            }
+        elif entry_date == today:
+            # Today's totals get unlogged goals added below, so leave the cached dict alone
+            date_totals = dict(date_totals)
 
         # If we're looking at today's data, add exercises with goals that haven't been logged
         if entry_date == today:
-            # Check if today is the last day of the week (Sunday)
-            today_date = datetime.datetime.strptime(today, "%Y-%m-%d")
-            is_last_day_of_week = today_date.weekday() == 6  # 6 is Sunday
-
-            for ex_type, goal_data in data["goals"].items():
-                # Check if this exercise has a weekly goal but no daily goal
-                has_weekly_goal_only = "weekly" in goal_data and ("daily" not in goal_data or goal_data["daily"] == 0)
-
-                # If it has a weekly goal only, we need to check if the weekly goal has been met
-                if has_weekly_goal_only:
-                    # Calculate the start of the week (Monday)
-                    start_of_week = today_date - datetime.timedelta(days=today_date.weekday())
-                    start_date_str = start_of_week.strftime("%Y-%m-%d")
-
-                    # Calculate total for the week
-                    weekly_total = 0
-                    weekly_weight_total = 0
-                    weekly_sets_total = 0
-
-                    for date_str in data["entries"]:
-                        if start_date_str <= date_str <= today:
-                            for entry in data["entries"][date_str]:
-                                if entry["exercise_type"] == ex_type:
-                                    amount = entry["amount"]
-                                    weight = entry.get("weight", 0)
-                                    sets = entry.get("sets", 1)
-                                    weekly_total += amount * sets
-                                    weekly_weight_total += amount * weight * sets
-                                    weekly_sets_total += sets
-
-                    # Check if weekly goal has been met
-                    weekly_goal = goal_data["weekly"]
-                    goal_sets = goal_data.get("sets", 1)
-                    weekly_goal_met = weekly_total >= weekly_goal * goal_sets
-
-                    # If weekly goal has not been met, add it to date_totals
-                    if not weekly_goal_met:
-                        # Initialize with weekly values
-                        date_totals[ex_type] = {
-                            "amount": weekly_total,
-                            "weight_total": weekly_weight_total,
-                            "sets_total": weekly_sets_total,
-                            "weekly_goal_only": True,  # Flag to indicate this exercise has only a weekly goal
-                            "weekly_goal_met": False,  # Flag to indicate the weekly goal has not been met
-                            "is_last_day_of_week": is_last_day_of_week  # Flag to indicate if today is the last day of the week
-                        }
-                elif ex_type not in date_totals:
-                    # Initialize with zero values for exercises with daily goals
-                    date_totals[ex_type] = {
-                        "amount": 0,
-                        "weight_total": 0,
-                        "sets_total": 0,
-                        "not_logged": True  # Flag to indicate this exercise hasn't been logged
-                    }
+            _add_goal_rows(date_totals, data["goals"], weekly_totals, today_is_last_day_of_week)
 
         date_progress = calculate_progress(date_totals, data["goals"], week, month)
-        click.echo("\nTotals:")
+        out.append("\nTotals:")
         for ex_type, total_data in date_totals.items():
-            unit = data["exercise_types"].get(ex_type, {}).get("unit", "reps")
-
-            # Check if this exercise hasn't been logged or has a weekly goal only
-            not_logged = total_data.get("not_logged", False)
-            weekly_goal_only = total_data.get("weekly_goal_only", False)
-            is_last_day_of_week = total_data.get("is_last_day_of_week", False)
-
-            if not_logged:
-                formatted_total = "Not logged"
-            elif weekly_goal_only:
-                formatted_total = format_exercise_amount(total_data["amount"], unit)
-
-                # Add sets information if more than 1
-                if total_data["sets_total"] > 1:
-                    formatted_total += f" (in {total_data['sets_total']} sets)"
-
-                # Add weight information if applicable
-                if total_data["weight_total"] > 0:
-                    formatted_total += f" - Total weight: {total_data['weight_total']}kg"
-
-                # Add weekly goal notification
-                if is_last_day_of_week:
-                    formatted_total += " (WEEKLY GOAL NOT MET - LAST DAY!)"
-                else:
-                    formatted_total += " (Weekly goal not met)"
-            else:
-                formatted_total = format_exercise_amount(total_data["amount"], unit)
-
-                # Add sets information if more than 1
-                if total_data["sets_total"] > 1:
-                    formatted_total += f" (in {total_data['sets_total']} sets)"
-
-                # Add weight information if applicable
-                if total_data["weight_total"] > 0:
-                    formatted_total += f" - Total weight: {total_data['weight_total']}kg"
+            unit = unit_by_type.get(ex_type, "reps")
+            formatted_total = _format_total_line(total_data, unit)
 
             # Show progress if applicable
             progress_str = ""
@@ -367,49 +359,18 @@ def list_exercises(date, week, month, exercise, summary):
                 if progress_data["weight"] > 0:
                     progress_str += f" (Weight: {progress_data['weight']}% of goal)"
 
-            click.echo(f"- {ex_type}: {formatted_total}{progress_str}")
+            out.append(f"- {ex_type}: {formatted_total}{progress_str}")
             if progress_bar:
-                click.echo(f"  {progress_bar}")
+                out.append(f"  {progress_bar}")
 
     # Show overall totals if multiple dates
     if len(filtered_entries) > 1:
-        click.echo("\nOverall Totals:")
+        all_totals = _combined_totals(cache["per_date_totals"], filtered_entries, exercise_lower)
+        progress = calculate_progress(all_totals, data["goals"], week, month)
+        out.append("\nOverall Totals:")
         for ex_type, total_data in all_totals.items():
-            unit = data["exercise_types"].get(ex_type, {}).get("unit", "reps")
-
-            # Check if this exercise hasn't been logged or has a weekly goal only
-            not_logged = total_data.get("not_logged", False)
-            weekly_goal_only = total_data.get("weekly_goal_only", False)
-            is_last_day_of_week = total_data.get("is_last_day_of_week", False)
-
-            if not_logged:
-                formatted_total = "Not logged"
-            elif weekly_goal_only:
-                formatted_total = format_exercise_amount(total_data["amount"], unit)
-
-                # Add sets information if more than 1
-                if total_data["sets_total"] > 1:
-                    formatted_total += f" (in {total_data['sets_total']} sets)"
-
-                # Add weight information if applicable
-                if total_data["weight_total"] > 0:
-                    formatted_total += f" - Total weight: {total_data['weight_total']}kg"
-
-                # Add weekly goal notification
-                if is_last_day_of_week:
-                    formatted_total += " (WEEKLY GOAL NOT MET - LAST DAY!)"
-                else:
-                    formatted_total += " (Weekly goal not met)"
-            else:
-                formatted_total = format_exercise_amount(total_data["amount"], unit)
-
-                # Add sets information if more than 1
-                if total_data["sets_total"] > 1:
-                    formatted_total += f" (in {total_data['sets_total']} sets)"
-
-                # Add weight information if applicable
-                if total_data["weight_total"] > 0:
-                    formatted_total += f" - Total weight: {total_data['weight_total']}kg"
+            unit = unit_by_type.get(ex_type, "reps")
+            formatted_total = _format_total_line(total_data, unit)
 
             # Show progress if applicable
             progress_str = ""
@@ -424,6 +385,8 @@ def list_exercises(date, week, month, exercise, summary):
                 if progress_data["weight"] > 0:
                     progress_str += f" (Weight: {progress_data['weight']}% of goal)"
 
-            click.echo(f"- {ex_type}: {formatted_total}{progress_str}")
+            out.append(f"- {ex_type}: {formatted_total}{progress_str}")
             if progress_bar:
-                click.echo(f"  {progress_bar}")
+                out.append(f"  {progress_bar}")
+
+    click.echo("\n".join(out))
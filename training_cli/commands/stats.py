@@ -2,11 +2,12 @@
 Stats command for the Training CLI application.
 Provides comprehensive statistics for exercises.
 """
+import bisect
 import click
 import datetime
-from tabulate import tabulate
+import functools
 from collections import defaultdict
-from training_cli.utils.data import load_data
+from training_cli.utils.cache import load_data_cached
 from training_cli.utils.helpers import get_today_date, validate_date, calculate_total_by_exercise, format_exercise_amount
 
 @click.command()
@@ -17,10 +18,12 @@ from training_cli.utils.helpers import get_today_date, validate_date, calculate_
 @click.option("--output", "-o", help="Save the statistics to a file.")
 def stats(days, month, exercise, muscle, output):
     """Show comprehensive statistics for your exercises."""
-    data = load_data()
+    data, cache = load_data_cached()
+    unit_by_type = {ex_type: info.get("unit", "reps") for ex_type, info in data["exercise_types"].items()}
+    muscle_groups_by_type = {ex_type: info.get("muscle_groups", []) for ex_type, info in data["exercise_types"].items()}
     
     # Determine the date range
-    end_date = datetime.datetime.strptime(get_today_date(), "%Y-%m-%d")
+    end_date = datetime.date.fromisoformat(get_today_date())
     
     if month:
         # Start from the beginning of the month
@@ -30,41 +33,55 @@ def stats(days, month, exercise, muscle, output):
         start_date = end_date - datetime.timedelta(days=days-1)
     
     # Format dates as strings
-    start_date_str = start_date.strftime("%Y-%m-%d")
-    end_date_str = end_date.strftime("%Y-%m-%d")
+    start_date_str = start_date.isoformat()
+    end_date_str = end_date.isoformat()
     
     # Get all dates in the range
-    date_range = []
-    current_date = start_date
-    while current_date <= end_date:
-        date_range.append(current_date.strftime("%Y-%m-%d"))
-        current_date += datetime.timedelta(days=1)
-    
-    # Filter entries by date range and exercise/muscle group if specified
-    filtered_entries = {}
-    for entry_date, entries in data["entries"].items():
-        if start_date_str <= entry_date <= end_date_str:
-            filtered_entries[entry_date] = []
-            for entry in entries:
-                # Filter by exercise type if specified
-                if exercise and entry["exercise_type"].lower() != exercise.lower():
-                    continue
-                
-                # Filter by muscle group if specified
-                if muscle:
-                    exercise_type = entry["exercise_type"]
-                    muscle_groups = data["exercise_types"].get(exercise_type, {}).get("muscle_groups", [])
-                    if muscle.lower() not in [m.lower() for m in muscle_groups]:
-                        continue
-                
-                filtered_entries[entry_date].append(entry)
-            
-            # Remove dates with no entries after filtering
-            if not filtered_entries[entry_date]:
-                del filtered_entries[entry_date]
+    date_range = [
+        (start_date + datetime.timedelta(days=offset)).isoformat()
+        for offset in range((end_date - start_date).days + 1)
+    ]
+    
+    # Lowercase the filters and each exercise type's muscle groups once
+    exercise_lower = exercise.lower() if exercise else None
+    muscle_lower = muscle.lower() if muscle else None
+    muscles_lower = {
+        exercise_type: frozenset(m.lower() for m in muscle_groups)
+        for exercise_type, muscle_groups in muscle_groups_by_type.items()
+    } if muscle else {}
+    
+    @functools.lru_cache(maxsize=None)
+    def type_matches(exercise_type):
+        """Return whether an exercise type passes the exercise and muscle group filters."""
+        if exercise_lower and exercise_type.lower() != exercise_lower:
+            return False
+        if muscle_lower and muscle_lower not in muscles_lower.get(exercise_type, ()):
+            return False
+        return True
+    
+    # Take each date's totals per exercise type from the cached rollups, keeping the
+    # exercise types that pass the filters
+    all_dates = cache["sorted_dates"]
+    daily_summary = {}
+    for entry_date in all_dates[bisect.bisect_left(all_dates, start_date_str):bisect.bisect_right(all_dates, end_date_str)]:
+        max_weights = cache["per_date_max_weight"][entry_date]
+        day_summary = {
+            exercise_type: {
+                "reps": totals["amount"],
+                "sets": totals["sets_total"],
+                "weight": totals["weight_total"],
+                "max_weight": max_weights.get(exercise_type, 0)
+            }
+            for exercise_type, totals in cache["per_date_totals"][entry_date].items()
+            if type_matches(exercise_type)
+        }
+        
+        # Skip dates with no entries after filtering
+        if day_summary:
+            daily_summary[entry_date] = day_summary
     
     # Check if there are any entries to analyze
-    if not filtered_entries:
+    if not daily_summary:
         if exercise and muscle:
             click.echo(f"No entries found for exercise '{exercise}' and muscle group '{muscle}' in the selected date range.")
         elif exercise:
@@ -75,105 +92,88 @@ def stats(days, month, exercise, muscle, output):
             click.echo("No entries found for the selected date range.")
         return
     
+    # Collect the output and write it in one go at the end
+    out = []
+    
     # Display header
     if exercise and muscle:
-        click.echo(f"Exercise Statistics for '{exercise}' (Muscle Group: {muscle}) - {start_date_str} to {end_date_str}:")
+        out.append(f"Exercise Statistics for '{exercise}' (Muscle Group: {muscle}) - {start_date_str} to {end_date_str}:")
     elif exercise:
-        click.echo(f"Exercise Statistics for '{exercise}' - {start_date_str} to {end_date_str}:")
+        out.append(f"Exercise Statistics for '{exercise}' - {start_date_str} to {end_date_str}:")
     elif muscle:
-        click.echo(f"Exercise Statistics for Muscle Group '{muscle}' - {start_date_str} to {end_date_str}:")
+        out.append(f"Exercise Statistics for Muscle Group '{muscle}' - {start_date_str} to {end_date_str}:")
     else:
-        click.echo(f"Exercise Statistics - {start_date_str} to {end_date_str}:")
+        out.append(f"Exercise Statistics - {start_date_str} to {end_date_str}:")
     
-    # Calculate exercise summary
-    exercise_summary = defaultdict(lambda: {"total_reps": 0, "total_sets": 0, "total_weight": 0, "days": 0, "max_weight": 0})
+    # Calculate exercise summary from the day totals
+    exercise_summary = {}
     
-    for entry_date, entries in filtered_entries.items():
-        # Track unique exercises per day
-        exercises_on_date = set()
-        
-        for entry in entries:
-            exercise_type = entry["exercise_type"]
-            amount = entry["amount"]
-            weight = entry.get("weight", 0)
-            sets = entry.get("sets", 1)
-            
-            # Update summary
-            exercise_summary[exercise_type]["total_reps"] += amount * sets
-            exercise_summary[exercise_type]["total_sets"] += sets
-            exercise_summary[exercise_type]["total_weight"] += amount * weight * sets
+    for day_summary in daily_summary.values():
+        for exercise_type, day_totals in day_summary.items():
+            summary = exercise_summary.get(exercise_type)
+            if summary is None:
+                summary = exercise_summary[exercise_type] = {"total_reps": 0, "total_sets": 0, "total_weight": 0, "days": 0, "max_weight": 0}
+            summary["total_reps"] += day_totals["reps"]
+            summary["total_sets"] += day_totals["sets"]
+            summary["total_weight"] += day_totals["weight"]
+            summary["days"] += 1
             
             # Track max weight
-            if weight > exercise_summary[exercise_type]["max_weight"]:
-                exercise_summary[exercise_type]["max_weight"] = weight
-            
-            # Add to unique exercises for this day
-            exercises_on_date.add(exercise_type)
-        
-        # Update days count for each exercise
-        for ex in exercises_on_date:
-            exercise_summary[ex]["days"] += 1
+            if day_totals["max_weight"] > summary["max_weight"]:
+                summary["max_weight"] = day_totals["max_weight"]
+    
+    # The rollups were taken in date order
+    sorted_dates = list(daily_summary)
     
     # Calculate muscle group summary
-    muscle_summary = defaultdict(lambda: {"total_reps": 0, "total_weight": 0, "exercises": set()})
+    muscle_summary = {}
     
     for exercise_type, summary in exercise_summary.items():
-        muscle_groups = data["exercise_types"].get(exercise_type, {}).get("muscle_groups", [])
-        for muscle_group in muscle_groups:
-            muscle_summary[muscle_group]["total_reps"] += summary["total_reps"]
-            muscle_summary[muscle_group]["total_weight"] += summary["total_weight"]
-            muscle_summary[muscle_group]["exercises"].add(exercise_type)
+        for muscle_group in muscle_groups_by_type.get(exercise_type, []):
+            group_summary = muscle_summary.get(muscle_group)
+            if group_summary is None:
+                group_summary = muscle_summary[muscle_group] = {"total_reps": 0, "total_weight": 0, "exercises": set()}
+            group_summary["total_reps"] += summary["total_reps"]
+            group_summary["total_weight"] += summary["total_weight"]
+            group_summary["exercises"].add(exercise_type)
+    
+    # Index each exercise type's day totals in date order
+    days_by_exercise = defaultdict(list)
+    for entry_date in sorted_dates:
+        for exercise_type, day_totals in daily_summary[entry_date].items():
+            days_by_exercise[exercise_type].append((entry_date, day_totals))
     
     # Calculate weight progression
     weight_progression = {}
     
     for exercise_type in exercise_summary:
-        weight_progression[exercise_type] = []
-        
-        for entry_date in sorted(filtered_entries.keys()):
-            max_weight_for_day = 0
-            for entry in filtered_entries[entry_date]:
-                if entry["exercise_type"] == exercise_type:
-                    weight = entry.get("weight", 0)
-                    if weight > max_weight_for_day:
-                        max_weight_for_day = weight
-            
-            if max_weight_for_day > 0:
-                weight_progression[exercise_type].append((entry_date, max_weight_for_day))
+        weight_progression[exercise_type] = [
+            (entry_date, day_totals["max_weight"])
+            for entry_date, day_totals in days_by_exercise[exercise_type]
+            if day_totals["max_weight"] > 0
+        ]
     
     # Calculate goal achievement
     goal_achievement = {}
     
     for exercise_type, goal_data in data["goals"].items():
-        if exercise and exercise.lower() != exercise_type.lower():
+        if not type_matches(exercise_type):
             continue
         
-        if muscle:
-            muscle_groups = data["exercise_types"].get(exercise_type, {}).get("muscle_groups", [])
-            if muscle.lower() not in [m.lower() for m in muscle_groups]:
-                continue
-        
         daily_goal = goal_data.get("daily", 0)
         if daily_goal > 0:
-            days_with_goal = 0
-            days_achieved = 0
+            days_with_goal = len(date_range)
             
-            for entry_date in date_range:
-                days_with_goal += 1
-                
-                # Calculate total for this date
-                if entry_date in filtered_entries:
-                    total_reps = 0
-                    for entry in filtered_entries[entry_date]:
-                        if entry["exercise_type"] == exercise_type:
-                            amount = entry["amount"]
-                            sets = entry.get("sets", 1)
-                            total_reps += amount * sets
-                    
-                    # Check if goal was achieved
-                    goal_sets = goal_data.get("sets", 1)
-                    if total_reps >= daily_goal * goal_sets:
-                        days_achieved += 1
+            # Count the days on which the goal was achieved
+            goal_total = daily_goal * goal_data.get("sets", 1)
+            if goal_total > 0:
+                days_achieved = sum(
+                    1 for _, day_totals in days_by_exercise.get(exercise_type, ())
+                    if day_totals["reps"] >= goal_total
+                )
+            else:
+                # Any day with entries meets a goal of zero
+                days_achieved = len(sorted_dates)
             
             if days_with_goal > 0:
                 achievement_pct = int((days_achieved / days_with_goal) * 100)
@@ -183,47 +183,39 @@ def stats(days, month, exercise, muscle, output):
                     "achievement_pct": achievement_pct
                 }
     
-    # Calculate streak analysis
+    # Calculate streak analysis in one sweep over the date range, which is consecutive
+    # days, so a streak continues when an exercise was also done on the previous index
     streak_analysis = {}
+    last_index = {}
     
-    for exercise_type in exercise_summary:
-        current_streak = 0
-        longest_streak = 0
-        last_date = None
-        
-        for entry_date in sorted(date_range):
-            has_exercise = False
+    for index, entry_date in enumerate(date_range):
+        for exercise_type in daily_summary.get(entry_date, ()):
+            streaks = streak_analysis.get(exercise_type)
+            if streaks is None:
+                streaks = streak_analysis[exercise_type] = {"current_streak": 0, "longest_streak": 0}
             
-            if entry_date in filtered_entries:
-                for entry in filtered_entries[entry_date]:
-                    if entry["exercise_type"] == exercise_type:
-                        has_exercise = True
-                        break
-            
-            if has_exercise:
-                if last_date is None or (datetime.datetime.strptime(entry_date, "%Y-%m-%d") - 
-                                         datetime.datetime.strptime(last_date, "%Y-%m-%d")).days == 1:
-                    current_streak += 1
-                else:
-                    current_streak = 1
-                
-                longest_streak = max(longest_streak, current_streak)
-                last_date = entry_date
+            if last_index.get(exercise_type) == index - 1:
+                streaks["current_streak"] += 1
             else:
-                current_streak = 0
-                last_date = None
-        
-        streak_analysis[exercise_type] = {
-            "current_streak": current_streak,
-            "longest_streak": longest_streak
-        }
+                streaks["current_streak"] = 1
+            
+            streaks["longest_streak"] = max(streaks["longest_streak"], streaks["current_streak"])
+            last_index[exercise_type] = index
+    
+    # A streak is only current if it reaches the last day of the range
+    for exercise_type, streaks in streak_analysis.items():
+        if last_index[exercise_type] != len(date_range) - 1:
+            streaks["current_streak"] = 0
+    
+    # Each table is rendered once; the same text is echoed and, with --output, saved
+    from tabulate import tabulate
     
     # Display exercise summary
-    click.echo("\nExercise Summary:")
+    out.append("\nExercise Summary:")
     exercise_table = []
     
     for exercise_type, summary in sorted(exercise_summary.items()):
-        unit = data["exercise_types"].get(exercise_type, {}).get("unit", "reps")
+        unit = unit_by_type.get(exercise_type, "reps")
         total_reps = format_exercise_amount(summary["total_reps"], unit)
         avg_reps_per_day = format_exercise_amount(summary["total_reps"] / summary["days"] if summary["days"] > 0 else 0, unit)
         
@@ -238,15 +230,16 @@ def stats(days, month, exercise, muscle, output):
         ])
     
     headers = ["Exercise", "Total", "Sets", "Weight", "Days", "Avg/Day", "Max Weight"]
-    click.echo(tabulate(exercise_table, headers=headers, tablefmt="simple"))
+    exercise_text = tabulate(exercise_table, headers=headers, tablefmt="simple")
+    out.append(exercise_text)
     
     # Display muscle group summary
     if not exercise:  # Only show if not filtered by exercise
-        click.echo("\nMuscle Group Summary:")
+        out.append("\nMuscle Group Summary:")
         muscle_table = []
         
         for muscle_group, summary in sorted(muscle_summary.items()):
-            if muscle and muscle.lower() != muscle_group.lower():
+            if muscle_lower and muscle_group.lower() != muscle_lower:
                 continue
                 
             muscle_table.append([
@@ -258,15 +251,18 @@ def stats(days, month, exercise, muscle, output):
             ])
         
         headers = ["Muscle Group", "Total Reps", "Total Weight", "Exercises", "Exercise Types"]
-        click.echo(tabulate(muscle_table, headers=headers, tablefmt="simple"))
+        muscle_text = tabulate(muscle_table, headers=headers, tablefmt="simple")
+        out.append(muscle_text)
     
-    # Display weight progression
-    click.echo("\nWeight Progression:")
+    # Display weight progression, keeping each exercise's trend line and table
+    out.append("\nWeight Progression:")
+    progression_sections = []
     for exercise_type, progression in sorted(weight_progression.items()):
         if progression:
-            click.echo(f"\n{exercise_type}:")
+            out.append(f"\n{exercise_type}:")
             
             # Check if weight has increased
+            trend = None
             if len(progression) >= 2:
                 first_weight = progression[0][1]
                 last_weight = progression[-1][1]
@@ -274,13 +270,14 @@ def stats(days, month, exercise, muscle, output):
                 if last_weight > first_weight:
                     increase = last_weight - first_weight
                     increase_pct = (increase / first_weight) * 100
-                    click.echo(f"  Weight increased by {increase:.1f} kg ({increase_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg")
+                    trend = f"  Weight increased by {increase:.1f} kg ({increase_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg"
                 elif last_weight < first_weight:
                     decrease = first_weight - last_weight
                     decrease_pct = (decrease / first_weight) * 100
-                    click.echo(f"  Weight decreased by {decrease:.1f} kg ({decrease_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg")
+                    trend = f"  Weight decreased by {decrease:.1f} kg ({decrease_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg"
                 else:
-                    click.echo(f"  Weight remained constant at {first_weight:.1f} kg")
+                    trend = f"  Weight remained constant at {first_weight:.1f} kg"
+                out.append(trend)
             
             # Show progression table
             progression_table = []
@@ -288,11 +285,13 @@ def stats(days, month, exercise, muscle, output):
                 progression_table.append([date, f"{weight:.1f} kg"])
             
             headers = ["Date", "Weight"]
-            click.echo(tabulate(progression_table, headers=headers, tablefmt="simple"))
+            progression_text = tabulate(progression_table, headers=headers, tablefmt="simple")
+            out.append(progression_text)
+            progression_sections.append((exercise_type, trend, progression_text))
     
     # Display goal achievement
     if goal_achievement:
-        click.echo("\nGoal Achievement:")
+        out.append("\nGoal Achievement:")
         goal_table = []
         
         for exercise_type, achievement in sorted(goal_achievement.items()):
@@ -304,10 +303,11 @@ def stats(days, month, exercise, muscle, output):
             ])
         
         headers = ["Exercise", "Days Achieved", "Days with Goal", "Achievement"]
-        click.echo(tabulate(goal_table, headers=headers, tablefmt="simple"))
+        goal_text = tabulate(goal_table, headers=headers, tablefmt="simple")
+        out.append(goal_text)
     
     # Display streak analysis
-    click.echo("\nStreak Analysis:")
+    out.append("\nStreak Analysis:")
     streak_table = []
     
     for exercise_type, streaks in sorted(streak_analysis.items()):
@@ -318,55 +318,41 @@ def stats(days, month, exercise, muscle, output):
         ])
     
     headers = ["Exercise", "Current Streak", "Longest Streak"]
-    click.echo(tabulate(streak_table, headers=headers, tablefmt="simple"))
+    streak_text = tabulate(streak_table, headers=headers, tablefmt="simple")
+    out.append(streak_text)
+    
+    click.echo("\n".join(out))
     
-    # Save to file if requested
+    # Save to file if requested, assembling the report first and writing it at once
     if output:
+        report = [f"Exercise Statistics - {start_date_str} to {end_date_str}\n\n"]
+        
+        report.append("Exercise Summary:\n")
+        report.append(exercise_text)
+        report.append("\n\n")
+        
+        if not exercise:
+            report.append("Muscle Group Summary:\n")
+            report.append(muscle_text)
+            report.append("\n\n")
+        
+        report.append("Weight Progression:\n")
+        for exercise_type, trend, progression_text in progression_sections:
+            report.append(f"\n{exercise_type}:\n")
+            if trend is not None:
+                report.append(f"{trend}\n")
+            report.append(progression_text)
+            report.append("\n")
+        
+        if goal_achievement:
+            report.append("\nGoal Achievement:\n")
+            report.append(goal_text)
+            report.append("\n\n")
+        
+        report.append("Streak Analysis:\n")
+        report.append(streak_text)
+        
         with open(output, "w") as f:
-            f.write(f"Exercise Statistics - {start_date_str} to {end_date_str}\n\n")
-            
-            f.write("Exercise Summary:\n")
-            f.write(tabulate(exercise_table, headers=headers, tablefmt="simple"))
-            f.write("\n\n")
-            
-            if not exercise:
-                f.write("Muscle Group Summary:\n")
-                f.write(tabulate(muscle_table, headers=["Muscle Group", "Total Reps", "Total Weight", "Exercises", "Exercise Types"], tablefmt="simple"))
-                f.write("\n\n")
-            
-            f.write("Weight Progression:\n")
-            for exercise_type, progression in sorted(weight_progression.items()):
-                if progression:
-                    f.write(f"\n{exercise_type}:\n")
-                    
-                    if len(progression) >= 2:
-                        first_weight = progression[0][1]
-                        last_weight = progression[-1][1]
-                        
-                        if last_weight > first_weight:
-                            increase = last_weight - first_weight
-                            increase_pct = (increase / first_weight) * 100
-                            f.write(f"  Weight increased by {increase:.1f} kg ({increase_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg\n")
-                        elif last_weight < first_weight:
-                            decrease = first_weight - last_weight
-                            decrease_pct = (decrease / first_weight) * 100
-                            f.write(f"  Weight decreased by {decrease:.1f} kg ({decrease_pct:.1f}%) from {first_weight:.1f} kg to {last_weight:.1f} kg\n")
-                        else:
-                            f.write(f"  Weight remained constant at {first_weight:.1f} kg\n")
-                    
-                    progression_table = []
-                    for date, weight in progression:
-                        progression_table.append([date, f"{weight:.1f} kg"])
-                    
-                    f.write(tabulate(progression_table, headers=["Date", "Weight"], tablefmt="simple"))
-                    f.write("\n")
-            
-            if goal_achievement:
-                f.write("\nGoal Achievement:\n")
-                f.write(tabulate(goal_table, headers=["Exercise", "Days Achieved", "Days with Goal", "Achievement"], tablefmt="simple"))
-                f.write("\n\n")
-            
-            f.write("Streak Analysis:\n")
-            f.write(tabulate(streak_table, headers=["Exercise", "Current Streak", "Longest Streak"], tablefmt="simple"))
-            
-            click.echo(f"Statistics saved to {output}")
\ No newline at end of file
+            f.write("".join(report))
+        
+        click.echo(f"Statistics saved to {output}")
@@ -0,0 +1,75 @@
+"""
+Static help snapshot for the Training CLI application.
+Serves `training --help` and `training <command> --help` from a prebuilt
+JSON file so the help path doesn't build any click parsers.
+
+Regenerate the snapshot after changing commands or options:
+
+    python -m training_cli.static_help
+"""
+import json
+import os
+import shutil
+
+# Prebuilt help text, keyed by command name ("root" for the group itself)
+HELP_FILE = os.path.join(os.path.dirname(__file__), "_static_help.json")
+
+# Program name used in the "Usage:" lines of the snapshot
+PROG_NAME = "training"
+
+# Click wraps help text at 80 columns at most; narrower terminals need live rendering
+SNAPSHOT_WIDTH = 80
+
+def _help_key(args):
+    """Return the snapshot key for a help request, or None if args aren't one."""
+    if args == ["--help"]:
+        return "root"
+    if len(args) == 2 and args[1] == "--help" and not args[0].startswith("-"):
+        return args[0]
+    return None
+
+def print_static_help(args):
+    """
+    Print help for the given command-line arguments from the snapshot.
+
+    Args:
+        args (list): The command-line arguments, without the program name
+
+    Returns:
+        bool: True if the help was printed, False if the caller must run the CLI
+    """
+    key = _help_key(args)
+    if key is None or shutil.get_terminal_size().columns < SNAPSHOT_WIDTH:
+        return False
+    try:
+        with open(HELP_FILE, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if key not in snapshot:
+        return False
+    print(snapshot[key])
+    return True
+
+def build_static_help():
+    """Render the help text of the group and every subcommand."""
+    import click
+    from training_cli import cli
+
+    # Click renders live help two columns narrower than a wide terminal
+    root_ctx = click.Context(cli, info_name=PROG_NAME, terminal_width=SNAPSHOT_WIDTH - 2)
+    snapshot = {"root": cli.get_help(root_ctx)}
+    for name in cli.list_commands(root_ctx):
+        command = cli.get_command(root_ctx, name)
+        ctx = click.Context(command, info_name=name, parent=root_ctx)
+        snapshot[name] = command.get_help(ctx)
+    return snapshot
+
+def write_static_help():
+    """Write the help snapshot next to this module."""
+    with open(HELP_FILE, "w", encoding="utf-8") as f:
+        json.dump(build_static_help(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+if __name__ == "__main__":
+    write_static_help()
@@ -0,0 +1,90 @@
+"""
+Aggregate cache for the Training CLI application.
+Keeps values derived from the entries, such as per-date totals, in a pickle
+under ~/.cache so commands don't recompute them while the data is unchanged.
+"""
+import os
+import pickle
+from training_cli.utils.data import load_data, data_version
+from training_cli.utils.helpers import calculate_totals_for_entries
+
+# Directory for derived caches
+CACHE_DIR = os.path.expanduser("~/.cache/training_cli")
+
+# Pickled aggregates, validated against the data file version they were built from
+AGGREGATE_CACHE_FILE = os.path.join(CACHE_DIR, "data-cache-v3.pkl")
+
+def _build_aggregates(data):
+    """
+    Compute the cached aggregates for the loaded data.
+
+    Args:
+        data (dict): The loaded training data
+
+    Returns:
+        dict: A dictionary containing:
+            - sorted_dates: all entry dates in ascending order
+            - earliest_date / latest_date: the first and last entry dates, or None
+            - per_date_totals: date -> totals by exercise type, as returned by
+              calculate_totals_for_entries
+            - per_date_max_weight: date -> exercise type -> heaviest weight used
+            - type_index: lowercased exercise type -> (dates, positions), where
+              dates are the ascending dates with entries of that type and
+              positions holds, for each of those dates, the indexes of the
+              matching entries in that date's entry list
+    """
+    sorted_dates = sorted(data["entries"])
+    per_date_max_weight = {}
+    type_index = {}
+    for date in sorted_dates:
+        max_weights = per_date_max_weight[date] = {}
+        for position, entry in enumerate(data["entries"][date]):
+            weight = entry["weight"]
+            if weight > max_weights.get(entry["exercise_type"], 0):
+                max_weights[entry["exercise_type"]] = weight
+            dates, positions = type_index.setdefault(entry["exercise_type"].lower(), ([], []))
+            if not dates or dates[-1] != date:
+                dates.append(date)
+                positions.append([])
+            positions[-1].append(position)
+    return {
+        "sorted_dates": sorted_dates,
+        "earliest_date": sorted_dates[0] if sorted_dates else None,
+        "latest_date": sorted_dates[-1] if sorted_dates else None,
+        "per_date_totals": {
+            date: calculate_totals_for_entries(entries)
+            for date, entries in data["entries"].items()
+        },
+        "per_date_max_weight": per_date_max_weight,
+        "type_index": type_index,
+    }
+
+def load_data_cached():
+    """
+    Load training data together with its cached aggregates.
+
+    The aggregates are rebuilt and stored whenever the data file or entry log
+    has changed since they were cached.
+
+    Returns:
+        tuple: (data, aggregates) where aggregates is described in _build_aggregates
+    """
+    data = load_data()
+    version = data_version()
+    try:
+        with open(AGGREGATE_CACHE_FILE, "rb") as f:
+            cached_version, aggregates = pickle.load(f)
+        if cached_version == version:
+            return data, aggregates
+    except Exception:
+        # Missing, stale-format or corrupt cache is simply rebuilt
+        pass
+
+    aggregates = _build_aggregates(data)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(AGGREGATE_CACHE_FILE, "wb") as f:
+            pickle.dump((version, aggregates), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return data, aggregates
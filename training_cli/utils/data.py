@@ -1,40 +1,101 @@
 """
 Data utilities for the Training CLI application.
-Contains functions for loading and saving data to the JSON file.
+Contains functions for loading and saving data to the JSON file
+and appending new entries to the entry log.
 """
 import os
 import json
+import pickle
+import hashlib
 import datetime
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library parser, which is slower but always there
+    orjson = None
+
 # File to store training data
 DATA_FILE = os.path.expanduser("~/.training_data.json")
 
+# Pickled copy of the parsed data file, validated against the data file's stat
+CACHE_FILE = DATA_FILE + ".pkl"
+
+# Bumped whenever the shape of the loaded data changes, so older pickles are ignored
+CACHE_FORMAT = 2
+
+# Append-only log of entries added since the data file was last written
+LOG_FILE = DATA_FILE + ".log"
+
+# Fold the entry log back into the data file once it grows past this size
+LOG_COMPACT_SIZE = 256 * 1024
+
+# Digest of the data file contents as last read or written by this process
+_file_digest = None
+
+# Stat of the data file when ensure_data_file_exists last found it up to date
+_checked_stat = None
+
+# Data last loaded or saved by this process, and the data file key it matches
+_loaded = None
+_loaded_key = None
+
+def _loads(blob):
+    """Parse JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+def _dumps(obj, indent=False):
+    """Serialize obj to JSON bytes, indented by two spaces if indent is set."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _write_data_file(blob):
+    """Write blob to a temporary sibling of the data file and move it into place."""
+    tmp_file = DATA_FILE + ".tmp"
+    with open(tmp_file, "wb", buffering=1 << 16) as f:
+        f.write(blob)
+    os.replace(tmp_file, DATA_FILE)
+
 def ensure_data_file_exists():
     """Ensure the data file exists and has the correct structure."""
-    if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "w") as f:
-            json.dump({
-                "entries": {},  # Entries organized by date
-                "goals": {
-                    # Default goals for common exercises
-                    "pushup": {"daily": 50, "sets": 3, "weight": 0, "effective_date": "2023-01-01"},
-                    "squat": {"daily": 30, "sets": 3, "weight": 0, "effective_date": "2023-01-01"},
-                    "curl": {"daily": 20, "sets": 3, "weight": 5, "effective_date": "2023-01-01"}
-                },
-                "goal_history": {},
-                "exercise_types": {
-                    # Predefined exercise types with their attributes
-                    "pushup": {"unit": "reps", "muscle_groups": ["chest", "triceps", "shoulders"]},
-                    "squat": {"unit": "reps", "muscle_groups": ["quadriceps", "hamstrings", "glutes"]},
-                    "curl": {"unit": "reps", "muscle_groups": ["biceps", "forearms"]},
-                    "plank": {"unit": "seconds", "muscle_groups": ["core", "shoulders"]},
-                    "run": {"unit": "km", "muscle_groups": ["cardiovascular", "legs"]}
-                }
-            }, f)
+    global _checked_stat
+    try:
+        st = os.stat(DATA_FILE)
+    except FileNotFoundError:
+        st = None
+    if st is not None and (st.st_mtime_ns, st.st_size) == _checked_stat:
+        # Already checked by this process and unchanged since
+        return
+
+    if st is None:
+        _write_data_file(_dumps({
+            "entries": {},  # Entries organized by date
+            "goals": {
+                # Default goals for common exercises
+                "pushup": {"daily": 50, "sets": 3, "weight": 0, "effective_date": "2023-01-01"},
+                "squat": {"daily": 30, "sets": 3, "weight": 0, "effective_date": "2023-01-01"},
+                "curl": {"daily": 20, "sets": 3, "weight": 5, "effective_date": "2023-01-01"}
+            },
+            "goal_history": {},
+            "exercise_types": {
+                # Predefined exercise types with their attributes
+                "pushup": {"unit": "reps", "muscle_groups": ["chest", "triceps", "shoulders"]},
+                "squat": {"unit": "reps", "muscle_groups": ["quadriceps", "hamstrings", "glutes"]},
+                "curl": {"unit": "reps", "muscle_groups": ["biceps", "forearms"]},
+                "plank": {"unit": "seconds", "muscle_groups": ["core", "shoulders"]},
+                "run": {"unit": "km", "muscle_groups": ["cardiovascular", "legs"]}
+            }
+        }))
     else:
         # Migrate old data structure if needed
-        with open(DATA_FILE, "r") as f:
-            data = json.load(f)
+        with open(DATA_FILE, "rb") as f:
+            data = _loads(f.read())
+        dirty = False
 
         # Check if the data structure needs to be updated
         if "entries" in data and isinstance(data["entries"], type([])):
@@ -43,6 +104,7 @@ def ensure_data_file_exists():
             # Create new structure with entries organized by date
             today = datetime.datetime.now().strftime("%Y-%m-%d")
             data["entries"] = {today: old_entries}
+            dirty = True
 
         # Add goals if not present
         if "goals" not in data:
@@ -51,19 +113,34 @@ def ensure_data_file_exists():
                 "squat": {"daily": 30, "sets": 3, "weight": 0, "effective_date": "2023-01-01"},
                 "curl": {"daily": 20, "sets": 3, "weight": 5, "effective_date": "2023-01-01"}
             }
+            dirty = True
 
         # Add goal_history if not present
         if "goal_history" not in data:
             data["goal_history"] = {}
+            dirty = True
 
         # Update existing goals with new fields if needed
         for exercise_type, goal_data in data["goals"].items():
             if "sets" not in goal_data:
                 goal_data["sets"] = 3
+                dirty = True
             if "weight" not in goal_data:
                 goal_data["weight"] = 0
+                dirty = True
             if "effective_date" not in goal_data:
                 goal_data["effective_date"] = "2023-01-01"
+                dirty = True
+
+        # Give every entry a weight and a number of sets, so readers can index them
+        for entries in data["entries"].values():
+            for entry in entries:
+                if "weight" not in entry:
+                    entry["weight"] = 0
+                    dirty = True
+                if "sets" not in entry:
+                    entry["sets"] = 1
+                    dirty = True
 
         # Add exercise_types if not present
         if "exercise_types" not in data:
@@ -74,18 +151,159 @@ def ensure_data_file_exists():
                 "plank": {"unit": "seconds", "muscle_groups": ["core", "shoulders"]},
                 "run": {"unit": "km", "muscle_groups": ["cardiovascular", "legs"]}
             }
+            dirty = True
+
+        # Save updated structure, if anything had to be migrated
+        if dirty:
+            _write_data_file(_dumps(data, indent=True))
+
+    st = os.stat(DATA_FILE)
+    _checked_stat = (st.st_mtime_ns, st.st_size)
+
+def _data_file_key():
+    """Return the (mtime_ns, size) pairs identifying the data file and entry log contents."""
+    st = os.stat(DATA_FILE)
+    try:
+        log = os.stat(LOG_FILE)
+        log_key = (log.st_mtime_ns, log.st_size)
+    except FileNotFoundError:
+        log_key = None
+    return (st.st_mtime_ns, st.st_size, log_key)
+
+def data_version():
+    """
+    Return a value that changes whenever the stored data changes.
+
+    Combines the stat of the data file and entry log with the digest of the data
+    file contents, so call it after load_data().
+    """
+    return (_data_file_key(), _file_digest)
+
+def _digest(blob):
+    """Return a short digest of serialized data file contents."""
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+def _read_cache():
+    """Return the cached data if the pickle cache matches the data file, else None."""
+    global _file_digest
+    try:
+        key = _data_file_key()
+        with open(CACHE_FILE, "rb") as f:
+            cache_format, cached_key, digest, data = pickle.load(f)
+    except Exception:
+        # Missing, stale-format or corrupt cache just falls back to the JSON file
+        return None
+    if cache_format != CACHE_FORMAT or cached_key != key:
+        return None
+    _file_digest = digest
+    return data
+
+def _write_cache(data):
+    """Store data in the pickle cache, keyed on the current data file."""
+    try:
+        with open(CACHE_FILE, "wb") as f:
+            pickle.dump((CACHE_FORMAT, _data_file_key(), _file_digest, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
 
-        # Save updated structure
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+def _replay_log(data):
+    """Add the entries recorded in the entry log to data loaded from the data file."""
+    try:
+        f = open(LOG_FILE, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                record = _loads(line)
+            except ValueError:
+                # Skip blank lines and a torn last line from an interrupted write
+                continue
+            data["entries"].setdefault(record["date"], []).append(record["entry"])
+
+def _remember(data):
+    """Keep data as this process's copy of the data file in its current state."""
+    global _loaded, _loaded_key
+    _loaded = data
+    _loaded_key = _data_file_key()
 
 def load_data():
-    """Load training data from the data file."""
+    """
+    Load training data.
+
+    Repeated calls in one process return the same dictionary while the data file
+    and entry log are unchanged; otherwise the pickle cache is used when it
+    matches, and the JSON file is parsed only as a last resort.
+    """
+    if _loaded is not None:
+        try:
+            if _data_file_key() == _loaded_key:
+                return _loaded
+        except FileNotFoundError:
+            pass
+
+    data = _read_cache()
+    if data is not None:
+        _remember(data)
+        return data
+
+    global _file_digest
     ensure_data_file_exists()
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+    with open(DATA_FILE, "rb", buffering=1 << 16) as f:
+        blob = f.read()
+    data = _loads(blob)
+    _file_digest = _digest(blob)
+    _replay_log(data)
+    _write_cache(data)
+    _remember(data)
+    return data
 
 def save_data(data):
-    """Save training data to the data file."""
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    """
+    Save training data to the data file, clearing the entry log it now includes.
+
+    The file is written to a temporary sibling and moved into place, and the write
+    is skipped entirely when the serialized data matches the file's contents.
+    """
+    global _file_digest
+    blob = _dumps(data, indent=True)
+    digest = _digest(blob)
+    if digest == _file_digest and not os.path.exists(LOG_FILE):
+        _remember(data)
+        return
+
+    _write_data_file(blob)
+    _file_digest = digest
+    try:
+        os.remove(LOG_FILE)
+    except FileNotFoundError:
+        pass
+    _write_cache(data)
+    _remember(data)
+
+def append_entry(data, date, entry):
+    """
+    Persist a single new entry by appending it to the entry log.
+
+    Args:
+        data (dict): The loaded training data, already containing the entry
+        date (str): The date the entry belongs to (YYYY-MM-DD)
+        entry (dict): The entry to record
+    """
+    record = _dumps({"date": date, "entry": entry}) + b"\n"
+    with open(LOG_FILE, "ab+") as f:
+        # Start on a fresh line if an interrupted write left a torn last line
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                record = b"\n" + record
+        f.write(record)
+    if os.path.getsize(LOG_FILE) > LOG_COMPACT_SIZE:
+        compact(data)
+    else:
+        _write_cache(data)
+        _remember(data)
+
+def compact(data):
+    """Rewrite the data file with all logged entries and truncate the entry log."""
+    save_data(data)
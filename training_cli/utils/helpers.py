@@ -2,20 +2,42 @@
 Helper utilities for the Training CLI application.
 Contains utility functions for formatting and calculations.
 """
+import re
 import datetime
+import functools
+from collections import defaultdict
+
+# Today's date, computed once per process (a CLI run never spans midnight in practice)
+_TODAY = None
 
 def get_today_date():
     """Get today's date in YYYY-MM-DD format."""
-    return datetime.datetime.now().strftime("%Y-%m-%d")
+    global _TODAY
+    if _TODAY is None:
+        _TODAY = datetime.date.today().isoformat()
+    return _TODAY
+
+# Shape of a YYYY-MM-DD date string
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+# Days in each month of a non-leap year
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 def validate_date(date_str):
-    """Validate that a string is in YYYY-MM-DD format."""
-    try:
-        datetime.datetime.strptime(date_str, "%Y-%m-%d")
-        return True
-    except ValueError:
+    """Validate that a string is a real calendar date in YYYY-MM-DD format."""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    year, month, day = map(int, match.groups())
+    if not 1 <= month <= 12 or year < 1:
         return False
+    days = _DAYS_IN_MONTH[month - 1]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        days = 29
+    return 1 <= day <= days
 
+# Percentages are whole numbers, so only a handful of distinct bars are ever built
+@functools.lru_cache(maxsize=256)
 def create_progress_bar(percentage, width=20, fill_char='█', empty_char='░'):
     """
     Create an ASCII progress bar.
@@ -33,6 +55,63 @@ def create_progress_bar(percentage, width=20, fill_char='█', empty_char='░')
     empty_width = width - filled_width
     return fill_char * filled_width + empty_char * empty_width
 
+def calculate_totals_for_entries(entries):
+    """
+    Calculate the total reps/duration for each exercise type in a list of entries.
+
+    Args:
+        entries (list): The entries to total, e.g. the entries of a single date
+
+    Returns:
+        dict: A dictionary with exercise types as keys and dictionaries containing:
+            - amount: total reps/duration
+            - weight_total: total weight lifted (amount * weight * sets)
+            - sets_total: total sets
+    """
+    totals = {}
+    for entry in entries:
+        amount = entry["amount"]
+        weight = entry["weight"]
+        sets = entry["sets"]
+
+        # Initialize if not present
+        total = totals.get(entry["exercise_type"])
+        if total is None:
+            total = totals[entry["exercise_type"]] = {
+                "amount": 0,
+                "weight_total": 0,
+                "sets_total": 0
+            }
+
+        # Update totals
+        total["amount"] += amount * sets
+        total["weight_total"] += amount * weight * sets
+        total["sets_total"] += sets
+
+    return totals
+
+def calculate_totals_for_dates(per_date_totals, dates):
+    """
+    Combine per-date totals into totals for a set of dates.
+
+    Args:
+        per_date_totals (dict): Date -> totals by exercise type, as returned by
+            calculate_totals_for_entries
+        dates (iterable): The dates to combine; dates without totals are skipped
+
+    Returns:
+        dict: Totals by exercise type in the same format, as new dictionaries
+    """
+    totals = defaultdict(lambda: {"amount": 0, "weight_total": 0, "sets_total": 0})
+    for date in dates:
+        for exercise_type, total in per_date_totals.get(date, {}).items():
+            combined = totals[exercise_type]
+            combined["amount"] += total["amount"]
+            combined["weight_total"] += total["weight_total"]
+            combined["sets_total"] += total["sets_total"]
+    # Hand back a plain dict so later lookups of missing types don't insert them
+    return dict(totals)
+
 def calculate_total_by_exercise(entries, date=None):
     """
     Calculate the total reps/duration for each exercise type on a given date.
@@ -50,31 +129,7 @@ def calculate_total_by_exercise(entries, date=None):
     if date is None:
         date = get_today_date()
 
-    totals = {}
-    if date in entries:
-        for entry in entries[date]:
-            exercise_type = entry["exercise_type"]
-            amount = entry["amount"]
-            weight = entry.get("weight", 0)
-            sets = entry.get("sets", 1)
-
-            # Calculate total weight
-            weight_total = amount * weight * sets
-
-            # Initialize if not present
-            if exercise_type not in totals:
-                totals[exercise_type] = {
-                    "amount": 0,
-                    "weight_total": 0,
-                    "sets_total": 0
-                }
-
-            # Update totals
-            totals[exercise_type]["amount"] += amount * sets
-            totals[exercise_type]["weight_total"] += weight_total
-            totals[exercise_type]["sets_total"] += sets
-
-    return totals
+    return calculate_totals_for_entries(entries.get(date, []))
 
 def calculate_progress(totals, goals, week=False, month=False):
     """
@@ -145,17 +200,76 @@ def calculate_progress(totals, goals, week=False, month=False):
 
     return progress
 
+def goal_delta(previous, current):
+    """
+    Build a goal history record that holds only the fields a goal change replaced.
+
+    Args:
+        previous (dict): The goal before the change
+        current (dict): The goal after the change
+
+    Returns:
+        dict: The previous value of every changed field (None for fields the previous
+            goal didn't have), plus "_ts" with the date the change was recorded
+    """
+    keys = list(previous) + [k for k in current if k not in previous]
+    delta = {k: previous.get(k) for k in keys if previous.get(k) != current.get(k)}
+    delta["_ts"] = get_today_date()
+    return delta
+
+def expand_goal_history(history, current=None):
+    """
+    Rebuild full goal snapshots from an exercise's goal history.
+
+    History records are either full goal snapshots or deltas written by goal_delta(),
+    which are applied backwards starting from the goal that followed them. Snapshots
+    are written whenever a goal is deleted or cleared, so deltas never reach back past
+    a goal that was since removed.
+
+    Args:
+        history (list): The goal history records for one exercise type, oldest first
+        current (dict, optional): The exercise type's current goal, if it has one
+
+    Returns:
+        list: A full goal snapshot for each history record, oldest first
+    """
+    snapshots = []
+    following = current or {}
+    for record in reversed(history):
+        if "_ts" in record:
+            goal = dict(following)
+            for key, value in record.items():
+                if key == "_ts":
+                    continue
+                if value is None:
+                    goal.pop(key, None)
+                else:
+                    goal[key] = value
+        else:
+            goal = record
+        snapshots.append(goal)
+        following = goal
+    snapshots.reverse()
+    return snapshots
+
+def _format_seconds(amount, unit):
+    """Format a duration, as minutes and seconds if it's at least a minute."""
+    if amount >= 60:
+        minutes, seconds = divmod(amount, 60)
+        return f"{minutes}m {seconds}s"
+    return f"{amount}s"
+
+def _format_km(amount, unit):
+    """Format a distance with two decimals."""
+    return f"{amount:.2f} km"
+
+def _format_plain(amount, unit):
+    """Format an amount followed by its unit."""
+    return f"{amount} {unit}"
+
+# Amount formatter by unit; other units use _format_plain
+_AMOUNT_FORMATTERS = {"seconds": _format_seconds, "km": _format_km}
+
 def format_exercise_amount(amount, unit):
     """Format an exercise amount with its unit."""
-    if unit == "seconds":
-        # Format seconds as minutes:seconds if >= 60 seconds
-        if amount >= 60:
-            minutes = amount // 60
-            seconds = amount % 60
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{amount}s"
-    elif unit == "km":
-        return f"{amount:.2f} km"
-    else:
-        return f"{amount} {unit}"
+    return _AMOUNT_FORMATTERS.get(unit, _format_plain)(amount, unit)